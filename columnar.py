@@ -0,0 +1,88 @@
+import os
+import json
+import shutil
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+DICTIONARY_FILE = "dictionary.json"
+
+
+def write_columnar(directory: str, tables: Dict[str, Dict[str, np.ndarray]], dictionary: Dict[str, list]):
+    # one .npy file per typed column (<table>/<column>.npy) plus a JSON string dictionary that the
+    # integer code columns index into. Each export is written to its own versioned directory and
+    # `directory` is a symlink that is renamed over in one step, so the path always resolves to a
+    # complete export; the previous version is kept for readers that still have it open
+    parent, base = os.path.split(os.path.abspath(directory))
+    version = f"{base}-{datetime.now().strftime('%Y%m%dT%H%M%S%f')}"
+    tmp = os.path.join(parent, version)
+    os.makedirs(tmp)
+    manifest = {"tables": {}}
+    for table, columns in tables.items():
+        os.makedirs(os.path.join(tmp, table))
+        rows = {len(column) for column in columns.values()}
+        if len(rows) > 1:
+            raise ValueError(f"columns of table {table!r} have different lengths: {sorted(rows)}")
+        manifest["tables"][table] = {
+            "rows": rows.pop() if rows else 0,
+            "columns": {name: np.asarray(column).dtype.str for name, column in columns.items()}
+        }
+        for name, column in columns.items():
+            np.save(os.path.join(tmp, table, f"{name}.npy"), np.ascontiguousarray(column))
+    with open(os.path.join(tmp, DICTIONARY_FILE), "w") as f:
+        json.dump(dictionary, f)
+    with open(os.path.join(tmp, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    previous = os.readlink(directory) if os.path.islink(directory) else None
+    link = directory + ".link"
+    if os.path.lexists(link):
+        os.remove(link)
+    try:
+        os.symlink(version, link)
+    except OSError as e:
+        # no symlink support (e.g. Windows without the privilege): publish by renaming instead
+        print(f"Columnar export: cannot create a symlink ({e}); publishing {directory} by rename")
+        _publish_by_rename(tmp, directory)
+        previous = version = None
+    else:
+        if os.path.isdir(directory) and not os.path.islink(directory):
+            shutil.rmtree(directory)  # plain directory from an older export, replaced once by the link
+        os.replace(link, directory)
+
+    keep = {version, previous}
+    for entry in os.listdir(parent):
+        if entry.startswith(base + "-") and entry not in keep and os.path.isdir(os.path.join(parent, entry)):
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def _publish_by_rename(tmp: str, directory: str):
+    # the old export is moved aside before the new one is renamed into place, so a reader can find
+    # `directory` missing for that moment, but never sees a partly written export
+    old = directory + ".old"
+    if os.path.lexists(old):
+        shutil.rmtree(old, ignore_errors=True)
+    if os.path.islink(directory):
+        os.remove(directory)
+    elif os.path.isdir(directory):
+        os.replace(directory, old)
+    os.replace(tmp, directory)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def load_columnar(directory: str, mmap: bool = True) -> dict:
+    # returns {"dictionary": {...}, "<table>": {"<column>": ndarray}}; with mmap the columns are
+    # read-only memory maps, so loading costs a few file opens regardless of size
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        manifest = json.load(f)
+    with open(os.path.join(directory, DICTIONARY_FILE)) as f:
+        data = {"dictionary": json.load(f)}
+    mmap_mode = "r" if mmap else None
+    for table, info in manifest["tables"].items():
+        data[table] = {
+            name: np.load(os.path.join(directory, table, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in info["columns"]
+        }
+    return data
@@ -0,0 +1,56 @@
+import re
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
+SUSPICIOUS_PATTERNS = [
+    ("scam", ["money", "cash", "wire", "urgent payment"]),
+    ("inappropriate", ["personal info", "meet alone", "private"]),
+    ("spam", ["click here", "amazing deal", "limited time"])
+]
+
+
+class ContentScanner:
+    # every keyword of every flag type compiled into one search regex, so a description is lowercased
+    # and scanned once; templated descriptions repeat a lot, so results are memoized per text.
+    # Wherever a keyword starts, each flag type is tried in its own lookahead, so overlapping
+    # keywords ("cashop" -> cash, shop) all count, same as a plain substring test per keyword
+    def __init__(self, patterns: List[Tuple[str, List[str]]] = SUSPICIOUS_PATTERNS, cache_size: int = 65536):
+        self.flag_types = [flag_type for flag_type, _ in patterns]
+        self.bits = {flag_type: 1 << i for i, flag_type in enumerate(self.flag_types)}
+        self.all_mask = (1 << len(self.flag_types)) - 1
+        alternatives = []
+        for i, (flag_type, keywords) in enumerate(patterns):
+            words = sorted({keyword.lower() for keyword in keywords}, key=len, reverse=True)
+            alternatives.append((i, "|".join(re.escape(word) for word in words)))
+        self.pattern = re.compile("|".join(words for _, words in alternatives if words) or "(?!)")
+        self.groups = re.compile("".join(f"(?=(?P<f{i}>{words}))?" for i, words in alternatives if words))
+        self.group_bits = {f"f{i}": 1 << i for i in range(len(self.flag_types))}
+        self._names = [
+            [flag_type for i, flag_type in enumerate(self.flag_types) if mask >> i & 1]
+            for mask in range(self.all_mask + 1)
+        ]
+        self.mask = lru_cache(maxsize=cache_size)(self._mask)
+
+    def _mask(self, text: str) -> int:
+        text = text.lower()
+        mask = 0
+        pos = 0
+        while mask != self.all_mask:
+            hit = self.pattern.search(text, pos)
+            if hit is None:
+                break
+            pos = hit.start()
+            for group, value in self.groups.match(text, pos).groupdict().items():
+                if value is not None:
+                    mask |= self.group_bits[group]
+            pos += 1
+        return mask
+
+    def scan(self, text: str) -> List[str]:
+        return list(self._names[self.mask(text)])
+
+    def masks(self, texts: Iterable[str]) -> List[int]:
+        return [self.mask(text) for text in texts]
+
+
+default_scanner = ContentScanner()
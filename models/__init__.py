@@ -1,20 +1,46 @@
-from .base_agent import BaseAgent, DatabaseManager
-from .agent_orchestrator import AgentOrchestrator, orchestrator
-from .agent_runner import AgentRunner
-from .supply_demand_balencer.agent import SupplyDemandBalancerAgent
-from .org_sync_agent.agent import OrgSyncAgent
-from .volunteer_match_agent.agent import VolunteerMatchAgent
+import importlib
 
 __version__ = "1.0.0"
 __all__ = [
     "BaseAgent",
-    "DatabaseManager", 
+    "DatabaseManager",
+    "Record",
+    "QueryCache",
+    "AgentRegistry",
+    "registry",
     "AgentOrchestrator",
     "orchestrator",
     "AgentRunner",
     "SupplyDemandBalancerAgent",
-    "OrgSyncAgent", 
+    "OrgSyncAgent",
     "VolunteerMatchAgent"
 ]
 
+# public names are resolved from their submodule on first access, so `import models`
+# does not pull in every agent and its dependencies
+_LAZY_EXPORTS = {
+    "BaseAgent": ".base_agent",
+    "DatabaseManager": ".base_agent",
+    "Record": ".records",
+    "QueryCache": ".query_cache",
+    "AgentRegistry": ".agent_registry",
+    "registry": ".agent_registry",
+    "AgentOrchestrator": ".agent_orchestrator",
+    "orchestrator": ".agent_orchestrator",
+    "AgentRunner": ".agent_runner",
+    "SupplyDemandBalancerAgent": ".supply_demand_balencer.agent",
+    "OrgSyncAgent": ".org_sync_agent.agent",
+    "VolunteerMatchAgent": ".volunteer_match_agent.agent"
+}
 
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,11 +5,8 @@ from datetime import datetime, timezone, timedelta
 from dataclasses import dataclass
 from enum import Enum
 
-from .base_agent import BaseAgent
-from .supply_demand_balencer.agent import SupplyDemandBalancerAgent
-from .org_sync_agent.agent import OrgSyncAgent
-from .volunteer_match_agent.agent import VolunteerMatchAgent
-from .event_analysis_agent.agent import EventAnalysisAgent
+from .agent_registry import AgentRegistry, registry
+from .query_cache import shared_cache
 
 logger = logging.getLogger("agent_orchestrator")
 
@@ -33,13 +30,9 @@ class AgentResult:
 
 
 class AgentOrchestrator:
-    def __init__(self):
-        self.agents = {
-            'supply_demand_balancer': SupplyDemandBalancerAgent(),
-            'org_sync_agent': OrgSyncAgent(),
-            'volunteer_match_agent': VolunteerMatchAgent(),
-            'event_analysis_agent': EventAnalysisAgent()
-        }
+    def __init__(self, agents: Optional[AgentRegistry] = None):
+        # agents are built on first use by the registry, so constructing an orchestrator is cheap
+        self.agents = agents if agents is not None else registry
         self.execution_history = []
         self.is_running = False
         
@@ -70,6 +63,7 @@ class AgentOrchestrator:
                 'end_time': datetime.now(timezone.utc).isoformat(),
                 'results': results,
                 'aggregated_results': aggregated_results,
+                'cache_stats': shared_cache.stats(),
                 'status': 'completed'
             }
             self.execution_history.append(execution_record)
@@ -91,12 +85,12 @@ class AgentOrchestrator:
                 error=f"Agent {agent_name} not found"
             )
         
-        agent = self.agents[agent_name]
         start_time = datetime.now(timezone.utc)
         
         try:
             logger.info(f"Running agent: {agent_name}")
             
+            agent = self.agents[agent_name]
             result = await agent.process(input_data or {})
             execution_time = (datetime.now(timezone.utc) - start_time).total_seconds()
             
@@ -277,8 +271,8 @@ class AgentOrchestrator:
 
     def get_agent_status(self) -> Dict[str, str]:
         return {
-            agent_name: "available" if agent else "unavailable"
-            for agent_name, agent in self.agents.items()
+            agent_name: "loaded" if self.agents.is_loaded(agent_name) else "available"
+            for agent_name in self.agents
         }
 
     async def schedule_periodic_execution(self, interval_minutes: int = 60):
@@ -0,0 +1,66 @@
+import logging
+import importlib
+import threading
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Dict, Tuple
+
+if TYPE_CHECKING:
+    from .base_agent import BaseAgent
+
+logger = logging.getLogger("agent_registry")
+
+
+AGENT_SPECS: Dict[str, Tuple[str, str]] = {
+    'supply_demand_balancer': ('.supply_demand_balencer.agent', 'SupplyDemandBalancerAgent'),
+    'org_sync_agent': ('.org_sync_agent.agent', 'OrgSyncAgent'),
+    'volunteer_match_agent': ('.volunteer_match_agent.agent', 'VolunteerMatchAgent'),
+    'event_analysis_agent': ('.event_analysis_agent.agent', 'EventAnalysisAgent')
+}
+
+
+class AgentRegistry(Mapping):
+    # agents are imported and built on first lookup, then cached; listing names or checking
+    # membership never builds anything
+    def __init__(self, specs: Dict[str, Tuple[str, str]] = AGENT_SPECS):
+        self.specs = dict(specs)
+        self._agents: Dict[str, "BaseAgent"] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, agent_name: str) -> "BaseAgent":
+        agent = self._agents.get(agent_name)
+        if agent is not None:
+            return agent
+        if agent_name not in self.specs:
+            raise KeyError(agent_name)
+        with self._lock:
+            if agent_name not in self._agents:
+                module_name, class_name = self.specs[agent_name]
+                agent_class = getattr(importlib.import_module(module_name, __package__), class_name)
+                logger.info(f"Building agent: {agent_name}")
+                self._agents[agent_name] = agent_class()
+            return self._agents[agent_name]
+
+    def __iter__(self):
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __contains__(self, agent_name) -> bool:
+        return agent_name in self.specs
+
+    def is_loaded(self, agent_name: str) -> bool:
+        return agent_name in self._agents
+
+
+registry = AgentRegistry()
+
+
+def root_agent_getattr(agent_name: str, module_name: str):
+    # module-level __getattr__ for an agent module: `root_agent` is built on first access
+    # and shared with the orchestrator's registry
+    def __getattr__(name: str):
+        if name == "root_agent":
+            return registry[agent_name].agent
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+    return __getattr__
@@ -1,44 +1,136 @@
 import os
 import asyncio
 import logging
+import threading
 from datetime import datetime, timezone, timedelta
-from typing import Dict, Any, List, Optional, Callable
+from typing import TYPE_CHECKING, Dict, Any, Iterator, List, Optional, Callable, Sequence, Union
 from abc import ABC, abstractmethod
-from google.adk.agents import Agent, InvocationContext
-from google.adk.tools import FunctionTool
 from dotenv import load_dotenv
-from supabase import create_client, Client
+from .records import Record, decode_rows
+from .query_cache import QueryCache, shared_cache
+
+# google.adk, supabase and httpx are imported where they are first used, so importing the
+# models package (e.g. for agent_runner --mode status) stays cheap
+if TYPE_CHECKING:
+    from google.adk.tools import FunctionTool
+    from supabase import Client
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "10"))
+SUPABASE_KEEPALIVE_SECONDS = float(os.getenv("SUPABASE_KEEPALIVE_SECONDS", "60"))
+SUPABASE_TIMEOUT_SECONDS = float(os.getenv("SUPABASE_TIMEOUT_SECONDS", "120"))
+SUPABASE_PAGE_SIZE = int(os.getenv("SUPABASE_PAGE_SIZE", "1000"))
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("agents")
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    logger.error("SUPABASE_URL and SUPABASE_KEY environment variables must be set.")
-    raise SystemExit("Missing Supabase credentials")
+
+_shared_client: Optional["Client"] = None
+_shared_client_lock = threading.Lock()
+
+
+# one process-wide client, created on first use; every DatabaseManager shares it so all agents reuse
+# one keep-alive HTTP connection pool instead of each opening TLS sessions to the same host
+def get_supabase_client() -> "Client":
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                if not SUPABASE_URL or not SUPABASE_KEY:
+                    # a normal exception, so a failing agent build is reported as a FAILED result
+                    raise RuntimeError("Missing Supabase credentials: set SUPABASE_URL and SUPABASE_KEY")
+                import httpx
+                from supabase import create_client, ClientOptions
+
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=SUPABASE_POOL_SIZE,
+                        max_keepalive_connections=SUPABASE_POOL_SIZE,
+                        keepalive_expiry=SUPABASE_KEEPALIVE_SECONDS
+                    ),
+                    timeout=SUPABASE_TIMEOUT_SECONDS,
+                    follow_redirects=True
+                )
+                _shared_client = create_client(SUPABASE_URL, SUPABASE_KEY, options=ClientOptions(httpx_client=http_client))
+                logger.info("Supabase client created (pool size %d)", SUPABASE_POOL_SIZE)
+    return _shared_client
+
+
+# rows come back as plain dicts unless the caller passes `columns`; then only those columns are
+# requested and each row is decoded into a slotted Record (see records.py)
+Row = Union[Dict[str, Any], Record]
+
+
+def _projection(columns: Optional[Sequence[str]]) -> str:
+    return ",".join(columns) if columns else "*"
+
+
+def _decode(rows: Optional[List[Dict[str, Any]]], columns: Optional[Sequence[str]]) -> List[Row]:
+    if not rows:
+        return []
+    return decode_rows(rows, columns) if columns else rows
+
+
+def _cache_key(kind: str, filters: Optional[Dict[str, Any]], columns: Optional[Sequence[str]]) -> tuple:
+    # filter values are keyed by repr so unhashable values (lists) work and 1 and '1' stay distinct
+    return (kind, tuple(sorted((k, repr(v)) for k, v in (filters or {}).items())), tuple(columns or ()))
 
 
 class DatabaseManager:    
-    def __init__(self, supabase_client: Client):
-        self.client = supabase_client
+    def __init__(self, supabase_client: Optional["Client"] = None, cache: Optional[QueryCache] = None):
+        self.client = supabase_client or get_supabase_client()
+        # reference-table reads (categories, organization) are served from a process-wide TTL cache
+        self.cache = cache if cache is not None else shared_cache
+
+    def _select(self, table_name: str, filters: Optional[Dict[str, Any]], columns: Optional[Sequence[str]]) -> List[Row]:
+        query = self.client.table(table_name).select(_projection(columns))
+        if filters:
+            for k, v in filters.items():
+                query = query.eq(k, v)
+        res = query.execute()
+        return _decode(getattr(res, "data", None), columns)
 
-    def select_all(self, table_name: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    def select_all(self, table_name: str, filters: Optional[Dict[str, Any]] = None,
+                   columns: Optional[Sequence[str]] = None) -> List[Row]:
         try:
-            query = self.client.table(table_name).select("*")
-            if filters:
-                for k, v in filters.items():
-                    query = query.eq(k, v)
-            res = query.execute()
-            data = getattr(res, "data", None)
-            return data or []
+            return self.cache.get_or_load(table_name, _cache_key('select', filters, columns),
+                                          lambda: self._select(table_name, filters, columns))
         except Exception as e:
             logger.exception("Error selecting from %s: %s", table_name, e)
             return []
 
+    def stream(self, table_name: str, filters: Optional[Dict[str, Any]] = None, page_size: int = SUPABASE_PAGE_SIZE,
+               key: str = "id", columns: Optional[Sequence[str]] = None) -> Iterator[Row]:
+        # keyset pagination: each page is "key > last key seen" ordered by key, so memory stays at one
+        # page and deep pages cost the same as the first; rows inserted behind the cursor are not re-read
+        if columns and key not in columns:
+            columns = [*columns, key]
+        last_key = None
+        while True:
+            try:
+                query = self.client.table(table_name).select(_projection(columns))
+                if filters:
+                    for k, v in filters.items():
+                        query = query.eq(k, v)
+                if last_key is not None:
+                    query = query.gt(key, last_key)
+                res = query.order(key).limit(page_size).execute()
+            except Exception as e:
+                logger.exception("Error streaming from %s: %s", table_name, e)
+                if last_key is None:
+                    return  # nothing yielded yet: same empty result select_all gives on errors
+                # rows were already handed out, so stopping quietly would pass a partial table off as
+                # the whole one; callers must not act on it
+                raise RuntimeError(f"Streaming from {table_name} failed after {key} {last_key!r}") from e
+            rows = _decode(getattr(res, "data", None), columns)
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_key = rows[-1][key]
+
     def select_with_join(self, table_name: str, join_table: str, join_condition: str, filters: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
 
         try:
@@ -60,6 +152,8 @@ class DatabaseManager:
         except Exception as e:
             logger.exception("Error inserting into %s: %s", table_name, e)
             return None
+        finally:
+            self.cache.invalidate(table_name)
 
     def update(self, table_name: str, updates: Dict[str, Any], match: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
@@ -71,6 +165,8 @@ class DatabaseManager:
         except Exception as e:
             logger.exception("Error updating %s: %s", table_name, e)
             return None
+        finally:
+            self.cache.invalidate(table_name)
 
     def upsert(self, table_name: str, record: Dict[str, Any], on_conflict: Optional[List[str]] = None):
         try:
@@ -82,38 +178,44 @@ class DatabaseManager:
         except Exception as e:
             logger.exception("Error upserting into %s: %s", table_name, e)
             return None
+        finally:
+            self.cache.invalidate(table_name)
 
-    def get_posts_by_category(self, category: str, status: str = 'open') -> List[Dict[str, Any]]:
-        return self.select_all('posts', {'categories': category, 'status': status})
+    def get_posts_by_category(self, category: str, status: str = 'open',
+                              columns: Optional[Sequence[str]] = None) -> List[Row]:
+        return self.select_all('posts', {'categories': category, 'status': status}, columns=columns)
 
-    def get_profiles_by_skills(self, skills: List[str]) -> List[Dict[str, Any]]:
+    def get_profiles_by_skills(self, skills: List[str], columns: Optional[Sequence[str]] = None) -> List[Row]:
         try:
-            query = self.client.table('profiles').select("*")
+            query = self.client.table('profiles').select(_projection(columns))
             for skill in skills:
                 query = query.contains('skills', [skill])
             res = query.execute()
-            return getattr(res, "data", None) or []
+            return _decode(getattr(res, "data", None), columns)
         except Exception as e:
             logger.exception("Error getting profiles by skills: %s", e)
             return []
 
-    def get_profiles_by_role(self, role: str) -> List[Dict[str, Any]]:
+    def get_profiles_by_role(self, role: str, columns: Optional[Sequence[str]] = None) -> List[Row]:
         try:
-            query = self.client.table('profiles').select("*")
+            query = self.client.table('profiles').select(_projection(columns))
             query = query.contains('roles', [role])
             res = query.execute()
-            return getattr(res, "data", None) or []
+            return _decode(getattr(res, "data", None), columns)
         except Exception as e:
             logger.exception("Error getting profiles by role: %s", e)
             return []
 
-    def get_organizations_by_type(self, org_types: List[str]) -> List[Dict[str, Any]]:
-        try:
-            query = self.client.table('organization').select("*")
+    def get_organizations_by_type(self, org_types: List[str], columns: Optional[Sequence[str]] = None) -> List[Row]:
+        def load():
+            query = self.client.table('organization').select(_projection(columns))
             for org_type in org_types:
                 query = query.contains('types', [org_type])
             res = query.execute()
-            return getattr(res, "data", None) or []
+            return _decode(getattr(res, "data", None), columns)
+
+        try:
+            return self.cache.get_or_load('organization', _cache_key('types', {'types': org_types}, columns), load)
         except Exception as e:
             logger.exception("Error getting organizations by type: %s", e)
             return []
@@ -145,14 +247,15 @@ class BaseAgent(ABC):
 
     def _setup_database(self):
         try:
-            supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
-            self.db_manager = DatabaseManager(supabase_client)
+            self.db_manager = DatabaseManager(get_supabase_client())
             logger.info(f"Database connection established for {self.name}")
         except Exception as e:
             logger.error(f"Failed to setup database for {self.name}: {e}")
             raise
 
     def _create_agent(self):
+        from google.adk.agents import Agent
+
         tools = self._get_database_tools()
         self.agent = Agent(
             name=self.name,
@@ -162,7 +265,8 @@ class BaseAgent(ABC):
             tools=tools
         )
 
-    def _get_database_tools(self) -> List[FunctionTool]:
+    def _get_database_tools(self) -> List["FunctionTool"]:
+        from google.adk.tools import FunctionTool
 
         return [
             FunctionTool(self._tool_get_posts),
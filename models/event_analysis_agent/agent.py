@@ -4,6 +4,7 @@ import uuid
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from models.base_agent import BaseAgent
+from models.agent_registry import root_agent_getattr
 
 logger = logging.getLogger("event_analysis_agent")
 
@@ -217,7 +218,7 @@ class EventAnalysisAgent(BaseAgent):
 
     async def _create_event_top_need(self, event: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         try:
-            categories = self.db_manager.select_all('categories')
+            categories = self.db_manager.select_all('categories', columns=['id', 'slug'])
             event_category = next((cat for cat in categories if cat['slug'] == 'events'), None)
             category_id = event_category['id'] if event_category else categories[0]['id'] if categories else 1
             
@@ -254,4 +255,4 @@ class EventAnalysisAgent(BaseAgent):
         return datetime.now(timezone.utc).isoformat()
 
 
-root_agent = EventAnalysisAgent().agent
+__getattr__ = root_agent_getattr('event_analysis_agent', __name__)
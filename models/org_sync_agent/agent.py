@@ -4,6 +4,7 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
 from models.base_agent import BaseAgent
+from models.agent_registry import root_agent_getattr
 
 logger = logging.getLogger("org_sync_agent")
 
@@ -225,7 +226,7 @@ class OrgSyncAgent(BaseAgent):
             category_slug = category_mapping.get(urgent_need['type'], 'general')
             
 
-            categories = self.db_manager.select_all('categories')
+            categories = self.db_manager.select_all('categories', columns=['id', 'slug'])
             category_id = None
             for cat in categories:
                 if cat['slug'] == category_slug:
@@ -271,4 +272,4 @@ class OrgSyncAgent(BaseAgent):
 
 
 
-root_agent = OrgSyncAgent().agent
+__getattr__ = root_agent_getattr('org_sync_agent', __name__)
@@ -0,0 +1,72 @@
+import os
+import time
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# reference tables that change rarely; reads of other tables always go to the database
+CACHE_TTL_SECONDS: Dict[str, float] = {
+    'categories': float(os.getenv("CATEGORIES_CACHE_TTL_SECONDS", "600")),
+    'organization': float(os.getenv("ORGANIZATION_CACHE_TTL_SECONDS", "120"))
+}
+
+
+class QueryCache:
+    # read-through cache of query results keyed by (table, query key), with a TTL per table;
+    # writes through DatabaseManager invalidate every cached query of the written table
+    def __init__(self, ttl_seconds: Dict[str, float] = CACHE_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = dict(ttl_seconds)
+        self.clock = clock
+        self._entries: Dict[Tuple[str, Hashable], Tuple[float, List[Any]]] = {}
+        self._generations: Counter = Counter()
+        self._lock = threading.Lock()
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.invalidations: Counter = Counter()
+
+    def caches(self, table_name: str) -> bool:
+        return self.ttl_seconds.get(table_name, 0) > 0
+
+    def get_or_load(self, table_name: str, key: Hashable, loader: Callable[[], List[Any]]) -> List[Any]:
+        if not self.caches(table_name):
+            return loader()
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get((table_name, key))
+            if entry is not None and entry[0] > now:
+                self.hits[table_name] += 1
+                return list(entry[1])
+            self.misses[table_name] += 1
+            generation = self._generations[table_name]
+        # loaded outside the lock so a slow query does not block hits on other tables; a loader that
+        # raises leaves nothing cached, and a result read before a write to its table is not stored
+        rows = loader()
+        with self._lock:
+            if self._generations[table_name] == generation:
+                self._entries[(table_name, key)] = (now + self.ttl_seconds[table_name], list(rows))
+        return rows
+
+    def invalidate(self, table_name: Optional[str] = None):
+        with self._lock:
+            stale = [k for k in self._entries if table_name is None or k[0] == table_name]
+            for k in stale:
+                del self._entries[k]
+            for table in ([table_name] if table_name else self.ttl_seconds):
+                self._generations[table] += 1
+            self.invalidations[table_name or '*'] += 1
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            sizes = Counter(table for table, _ in self._entries)
+            return {
+                table: {
+                    'hits': self.hits[table],
+                    'misses': self.misses[table],
+                    'invalidations': self.invalidations[table],
+                    'entries': sizes[table]
+                }
+                for table in self.ttl_seconds
+            }
+
+
+shared_cache = QueryCache()
@@ -0,0 +1,71 @@
+import keyword
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Type
+
+
+class Record:
+    # slotted stand-in for a row dict when a query projects a fixed set of columns; keeps the
+    # read side of the dict API (get, [], in, keys, items) so agent code works on either
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __init__(self, row: Dict[str, Any]):
+        for name in self._fields:
+            if name in row:
+                setattr(self, name, row[name])
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name not in self._fields:
+            return default
+        return getattr(self, name, default)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self._fields:
+            try:
+                return getattr(self, name)
+            except AttributeError:
+                pass
+        raise KeyError(name)
+
+    def __contains__(self, name) -> bool:
+        return name in self._fields and hasattr(self, name)
+
+    def keys(self) -> List[str]:
+        return [name for name in self._fields if hasattr(self, name)]
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(name, getattr(self, name)) for name in self.keys()]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Record, dict)):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+@lru_cache(maxsize=None)
+def record_type(columns: Tuple[str, ...]) -> Type[Record]:
+    # one class per distinct projection, shared by every query that asks for the same columns
+    reserved = set(dir(Record))
+    for name in columns:
+        if not name.isidentifier() or keyword.iskeyword(name) or name in reserved:
+            raise ValueError(f"column {name!r} cannot be used as a record field")
+    if len(set(columns)) != len(columns):
+        raise ValueError(f"duplicate columns in projection: {columns}")
+    return type("Record", (Record,), {"__slots__": columns, "_fields": columns})
+
+
+def decode_rows(rows: Iterable[Dict[str, Any]], columns: Sequence[str]) -> List[Record]:
+    cls = record_type(tuple(columns))
+    return [cls(row) for row in rows]
@@ -1,4 +1,5 @@
 import os
+import sys
 import json
 import torch
 import numpy as np
@@ -20,31 +21,65 @@ from sklearn.metrics import accuracy_score, confusion_matrix, classification_rep
 import warnings
 warnings.filterwarnings('ignore')
 
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from columnar import load_columnar
+from content_scanner import default_scanner
 
-safety_data = json.load(open('data/sim_data/safety_trust_data.json'))
-posts = safety_data['posts_for_safety_check']
-users = {u["user_id"]: u for u in safety_data["user_safety_scores"]}
+COLUMNAR_DIR = 'data/sim_data/columnar'
 
 numeric_features = []
 target_feature = []
 texts = []
 
-for post in tqdm(posts, desc="Collecting features"):
-    user = users.get(post["user_id"], None)
-    if not user:
-        continue
+if os.path.isdir(COLUMNAR_DIR):
+    # memory-mapped typed columns written by sim.py, no JSON parsing
+    data = load_columnar(COLUMNAR_DIR)
+    posts = data['posts']
+    people = data['people']
+    order = np.argsort(people['id'])
+    pos = np.minimum(np.searchsorted(people['id'], posts['user_id'], sorter=order), len(order) - 1)
+    user_idx = order[pos]
+    known = people['id'][user_idx] == posts['user_id']
+    user_idx = user_idx[known]
+
+    descriptions = np.array(data['dictionary']['description'], dtype=object)
+    texts = descriptions[posts['description'][known]].tolist()
+    numeric_features = np.column_stack([
+        posts['is_duplicate'][known].astype(np.float64),
+        people['reputation'][user_idx],
+        people['safety_score'][user_idx],
+        people['posts_created'][user_idx]
+    ]).tolist()
+    flag_counts = np.unpackbits(posts['safety_flags'][known][:, None], axis=1).sum(axis=1)
+    target_feature = np.where(flag_counts > 1, 'HIGH', np.where(flag_counts > 0, 'MEDIUM', 'LOW')).tolist()
+else:
+    safety_data = json.load(open('data/sim_data/safety_trust_data.json'))
+    posts = safety_data['posts_for_safety_check']
+    users = {u["user_id"]: u for u in safety_data["user_safety_scores"]}
+    duplicate_flags = []
+
+    for post in tqdm(posts, desc="Collecting features"):
+        user = users.get(post["user_id"], None)
+        if not user:
+            continue
+
+        texts.append(post['content'])
+        
+        user_features = [
+            float(post['is_duplicate']),
+            user["reputation"],
+            user["safety_score"],
+            user["posts_created"]
+        ]
+        
+        numeric_features.append(user_features)
+        duplicate_flags.append('duplicate' in post['detected_flags'])
 
-    texts.append(post['content'])
-    
-    user_features = [
-        float(post['is_duplicate']),
-        user["reputation"],
-        user["safety_score"],
-        user["posts_created"]
-    ]
-    
-    numeric_features.append(user_features)
-    target_feature.append(post['risk_level'])
+    # labels come from the shared scanner plus the duplicate flag, the same rule sim.py applies to the
+    # columnar safety_flags, instead of the stored risk_level strings; the flags stay out of the features
+    flag_counts = np.array([bin(mask).count('1') for mask in default_scanner.masks(texts)], dtype=np.int64)
+    flag_counts += np.array(duplicate_flags, dtype=np.int64)
+    target_feature = np.where(flag_counts > 1, 'HIGH', np.where(flag_counts > 0, 'MEDIUM', 'LOW')).tolist()
 
 print("Original class distribution:", Counter(target_feature))
 
@@ -59,7 +94,6 @@ vectorizer = TfidfVectorizer(
 )
 text_features = vectorizer.fit_transform(texts).toarray()
 
-numeric_features = np.array(numeric_features)
 scaler = RobustScaler() 
 numeric_features_scaled = scaler.fit_transform(numeric_features)
 
@@ -1,10 +1,15 @@
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from collections import defaultdict, Counter
 from models.base_agent import BaseAgent
+from models.agent_registry import root_agent_getattr
 
 logger = logging.getLogger("supply_demand_balancer")
 
+# columns the analysis actually reads; everything else is left on the server
+POST_COLUMNS = ['id', 'categories', 'is_free', 'location_text']
+CATEGORY_COLUMNS = ['id', 'slug', 'title']
+
 
 class SupplyDemandBalancerAgent(BaseAgent):
     def __init__(self):
@@ -57,8 +62,8 @@ class SupplyDemandBalancerAgent(BaseAgent):
         try:
             logger.info(f"Starting supply-demand analysis for {self.name}")
             
-            posts = self.db_manager.select_all('posts', {'status': 'open'})
-            categories = self.db_manager.select_all('categories')
+            posts = self.db_manager.stream('posts', {'status': 'open'}, columns=POST_COLUMNS)
+            categories = self.db_manager.select_all('categories', columns=CATEGORY_COLUMNS)
             
 
             category_analysis = self._analyze_category_shortages(posts, categories)
@@ -87,33 +92,32 @@ class SupplyDemandBalancerAgent(BaseAgent):
             logger.error(f"Error in supply-demand analysis: {e}")
             return {"error": str(e)}
 
-    def _analyze_category_shortages(self, posts: List[Dict[str, Any]], categories: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    def _analyze_category_shortages(self, posts: Iterable[Dict[str, Any]], categories: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
         category_map = {cat['slug']: cat for cat in categories}
         analysis = {}
         
-        category_posts = defaultdict(list)
+        # posts are consumed one at a time (e.g. from DatabaseManager.stream); only locations are kept
+        category_locations = defaultdict(lambda: {'requests': [], 'offers': []})
         for post in posts:
             if post.get('categories'):
-                category_posts[post['categories']].append(post)
+                side = 'offers' if post.get('is_free', True) else 'requests'
+                category_locations[post['categories']][side].append(post.get('location_text', 'Unknown'))
         
-        for category_slug, category_posts_list in category_posts.items():
+        for category_slug, locations in category_locations.items():
             if category_slug not in category_map:
                 continue
                 
             category = category_map[category_slug]
-            requests = [p for p in category_posts_list if not p.get('is_free', True)]
-            offers = [p for p in category_posts_list if p.get('is_free', True)]
+            request_locations = locations['requests']
+            offer_locations = locations['offers']
             
-            request_count = len(requests)
-            offer_count = len(offers)
+            request_count = len(request_locations)
+            offer_count = len(offer_locations)
             
             shortage_ratio = (request_count - offer_count) / max(offer_count, 1) if offer_count > 0 else float('inf')
             is_shortage = (request_count >= self.minimum_requests and 
                           shortage_ratio > self.shortage_threshold)
             
-            request_locations = [p.get('location_text', 'Unknown') for p in requests]
-            offer_locations = [p.get('location_text', 'Unknown') for p in offers]
-            
             analysis[category_slug] = {
                 'category_id': category['id'],
                 'category_title': category['title'],
@@ -168,12 +172,12 @@ class SupplyDemandBalancerAgent(BaseAgent):
                 continue
             
 
-            providers = self.db_manager.get_profiles_by_role('provider')
+            providers = self.db_manager.get_profiles_by_role('provider', columns=['id'])
             
             org_types = self._get_relevant_org_types(category_slug)
             organizations = []
             for org_type in org_types:
-                orgs = self.db_manager.get_organizations_by_type([org_type])
+                orgs = self.db_manager.get_organizations_by_type([org_type], columns=['id'])
                 organizations.extend(orgs)
             
         
@@ -223,4 +227,4 @@ class SupplyDemandBalancerAgent(BaseAgent):
         return datetime.now(timezone.utc).isoformat()
 
 
-root_agent = SupplyDemandBalancerAgent().agent
\ No newline at end of file
+__getattr__ = root_agent_getattr('supply_demand_balancer', __name__)
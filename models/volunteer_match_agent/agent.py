@@ -1,12 +1,17 @@
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime, timezone
 from models.base_agent import BaseAgent
+from models.agent_registry import root_agent_getattr
 
 logger = logging.getLogger("volunteer_match_agent")
 
+# columns the matching reads; everything else is left on the server
+REQUEST_COLUMNS = ['id', 'author_id', 'is_free', 'title', 'description', 'location_text']
+VOLUNTEER_COLUMNS = ['id', 'display_name', 'skills', 'radius_meters']
+
 
 class VolunteerMatchAgent(BaseAgent):
     def __init__(self):
@@ -61,12 +66,14 @@ class VolunteerMatchAgent(BaseAgent):
         try:
             logger.info(f"Starting volunteer matching for {self.name}")
             
-            seeker_requests = await self._get_seeker_requests()
-            
-
             volunteers = await self._get_available_volunteers()
             
-            matches = await self._perform_matching(seeker_requests, volunteers)
+            # requests are matched as they stream in, so only one page of posts is held at a time
+            seeker_request_count = 0
+            matches = []
+            for request in self._stream_seeker_requests():
+                seeker_request_count += 1
+                matches.extend(self._match_request(request, volunteers))
             
             created_offers = []
             for match in matches:
@@ -79,7 +86,7 @@ class VolunteerMatchAgent(BaseAgent):
             suggestions = await self.generate_match_suggestions(matches)
             
             result = {
-                'seeker_requests': len(seeker_requests),
+                'seeker_requests': seeker_request_count,
                 'available_volunteers': len(volunteers),
                 'matches_found': len(matches),
                 'high_confidence_matches': len([m for m in matches if m['confidence'] >= 0.8]),
@@ -95,69 +102,57 @@ class VolunteerMatchAgent(BaseAgent):
             logger.error(f"Error in volunteer matching: {e}")
             return {"error": str(e)}
 
-    async def _get_seeker_requests(self) -> List[Dict[str, Any]]:
-        try:
-
-            all_posts = self.db_manager.select_all('posts', {'status': 'open'})
-            
-            seeker_requests = []
-            for post in all_posts:
-                if not post._get('is_free', True):
-                    author_profiles = self.db_manager.select_all('profiles', {'id': post['author_id']})
-                    if author_profiles:
-                        author = author_profiles[0]
-                        if 'provider' not in author._get('roles', []) or 'seeker' in author._get('roles', []):
-                            seeker_requests.append(post)
-            
-            logger.info(f"Found {len(seeker_requests)} seeker requests")
-            return seeker_requests
-            
-        except Exception as e:
-            logger.error(f"Error _getting seeker requests: {e}")
-            return []
+    def _stream_seeker_requests(self) -> Iterator[Dict[str, Any]]:
+        # authors usually have several open posts, so each profile is looked up once per pass
+        is_seeker = {}
+        for post in self.db_manager.stream('posts', {'status': 'open'}, columns=REQUEST_COLUMNS):
+            if post.get('is_free', True):
+                continue
+            author_id = post['author_id']
+            if author_id not in is_seeker:
+                author_profiles = self.db_manager.select_all('profiles', {'id': author_id}, columns=['roles'])
+                roles = author_profiles[0].get('roles') or [] if author_profiles else None
+                is_seeker[author_id] = roles is not None and ('provider' not in roles or 'seeker' in roles)
+            if is_seeker[author_id]:
+                yield post
 
     async def _get_available_volunteers(self) -> List[Dict[str, Any]]:
         try:
-            volunteers = self.db_manager.get_profiles_by_role('provider')
+            volunteers = self.db_manager.get_profiles_by_role('provider', columns=VOLUNTEER_COLUMNS)
             
             available_volunteers = []
             for volunteer in volunteers:
-                if volunteer.__get('skills') and len(volunteer['skills']) > 0:
+                if volunteer.get('skills') and len(volunteer['skills']) > 0:
                     available_volunteers.append(volunteer)
             
             logger.info(f"Found {len(available_volunteers)} available volunteers")
             return available_volunteers
             
         except Exception as e:
-            logger.error(f"Error __getting available volunteers: {e}")
+            logger.error(f"Error getting available volunteers: {e}")
             return []
 
-    async def _perform_matching(self, seeker_requests: List[Dict[str, Any]], volunteers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        matches = []
+    def _match_request(self, request: Dict[str, Any], volunteers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        request_matches = []
         
-        for request in seeker_requests:
-            request_matches = []
-            
-            for volunteer in volunteers:
-                match_score = self._calculate_match_score(request, volunteer)
-                
-                if match_score >= self.skill_match_threshold:
-                    match = {
-                        'request_id': request['id'],
-                        'volunteer_id': volunteer['id'],
-                        'confidence': match_score,
-                        'request_title': request.__get('title', ''),
-                        'volunteer_name': volunteer.__get('display_name', 'Anonymous'),
-                        'skills_match': self._get_skill_overlap(request, volunteer),
-                        'location_match': self._check_location_proximity(request, volunteer),
-                        'match_type': self._determine_match_type(request, volunteer)
-                    }
-                    request_matches.append(match)
+        for volunteer in volunteers:
+            match_score = self._calculate_match_score(request, volunteer)
             
-            request_matches.sort(key=lambda x: x['confidence'], reverse=True)
-            matches.extend(request_matches[:self.max_matches_per_request])
+            if match_score >= self.skill_match_threshold:
+                match = {
+                    'request_id': request['id'],
+                    'volunteer_id': volunteer['id'],
+                    'confidence': match_score,
+                    'request_title': request.get('title', ''),
+                    'volunteer_name': volunteer.get('display_name', 'Anonymous'),
+                    'skills_match': self._get_skill_overlap(request, volunteer),
+                    'location_match': self._check_location_proximity(request, volunteer),
+                    'match_type': self._determine_match_type(request, volunteer)
+                }
+                request_matches.append(match)
         
-        return matches
+        request_matches.sort(key=lambda x: x['confidence'], reverse=True)
+        return request_matches[:self.max_matches_per_request]
 
     def _calculate_match_score(self, request: Dict[str, Any], volunteer: Dict[str, Any]) -> float:
         skill_score = self._calculate_skill_score(request, volunteer)
@@ -173,8 +168,8 @@ class VolunteerMatchAgent(BaseAgent):
         return min(total_score, 1.0)
 
     def _calculate_skill_score(self, request: Dict[str, Any], volunteer: Dict[str, Any]) -> float:
-        request_skills = self.gxtract_skills_from_request(request)
-        volunteer_skills = volunteer._get('skills', [])
+        request_skills = self.extract_skills_from_request(request)
+        volunteer_skills = volunteer.get('skills', [])
         
         if not request_skills or not volunteer_skills:
             return 0.0
@@ -185,8 +180,8 @@ class VolunteerMatchAgent(BaseAgent):
 
     def _calculate_location_score(self, request: Dict[str, Any], volunteer: Dict[str, Any]) -> float:
 
-        request_location = request._get('location_text', '')
-        volunteer_radius = volunteer._get('radius_meters', 5000)
+        request_location = request.get('location_text', '')
+        volunteer_radius = volunteer.get('radius_meters', 5000)
         
         if request_location and volunteer_radius:
             return 0.8
@@ -195,8 +190,8 @@ class VolunteerMatchAgent(BaseAgent):
     def _calculate_availability_score(self, volunteer: Dict[str, Any]) -> float:
         return 0.7
 
-    def gxtract_skills_from_request(self, request: Dict[str, Any]) -> List[str]:
-        text = f"{request._get('title', '')} {request._get('description', '')}".lower()
+    def extract_skills_from_request(self, request: Dict[str, Any]) -> List[str]:
+        text = f"{request.get('title', '')} {request.get('description', '')}".lower()
         
         skill_keywords = {
             'tutoring': ['tutor', 'teach', 'education', 'homework', 'math', 'english'],
@@ -217,18 +212,18 @@ class VolunteerMatchAgent(BaseAgent):
         return found_skills
 
     def _get_skill_overlap(self, request: Dict[str, Any], volunteer: Dict[str, Any]) -> List[str]:
-        request_skills = self.gxtract_skills_from_request(request)
-        volunteer_skills = volunteer._get('skills', [])
+        request_skills = self.extract_skills_from_request(request)
+        volunteer_skills = volunteer.get('skills', [])
         return list(set(request_skills) & set(volunteer_skills))
 
     def _check_location_proximity(self, request: Dict[str, Any], volunteer: Dict[str, Any]) -> bool:
-        request_location = request._get('location_text', '')
-        volunteer_radius = volunteer._get('radius_meters', 5000)
+        request_location = request.get('location_text', '')
+        volunteer_radius = volunteer.get('radius_meters', 5000)
         
         return bool(request_location and volunteer_radius)
 
     def _determine_match_type(self, request: Dict[str, Any], volunteer: Dict[str, Any]) -> str:
-        request_skills = self.gxtract_skills_from_request(request)
+        request_skills = self.extract_skills_from_request(request)
         if not request_skills:
             return 'general'
 
@@ -291,4 +286,4 @@ class VolunteerMatchAgent(BaseAgent):
         return datetime.now(timezone.utc).isoformat()
 
 
-root_agent = VolunteerMatchAgent().agent
+__getattr__ = root_agent_getattr('volunteer_match_agent', __name__)
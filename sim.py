@@ -3,16 +3,63 @@ import json
 import random
 import math
 import os
-from dataclasses import dataclass, asdict
-from typing import List
+import gzip
+import heapq
+import sqlite3
+import time
+import argparse
+import copy
+import itertools
+import threading
+import multiprocessing
+import numpy as np
+from dataclasses import dataclass, asdict, replace
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from collections import deque
 from datetime import datetime
 from enum import Enum
 
+from columnar import write_columnar
+from content_scanner import default_scanner
+
 pygame.init()
 
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
 FPS = 60
+SIM_TICK_SECONDS = 0.5  # simulated time per step(); posts used to arrive every FPS // 2 frames
+MAX_TICKS_PER_FRAME = 240  # catch-up cap so a long stall cannot spiral
+CHECKPOINT_INTERVAL_SECONDS = 10
+POST_RATE_PER_SECOND = 12.0  # town-wide posts per simulated second at activity 1 (the old 10-30 attempts x 30% per tick)
+POST_RATE_SHAPE = 2.0  # gamma shape of per-resident posting rates (mean 1); lower means a few residents post most
+ORG_UPDATE_INTERVAL = SIM_TICK_SECONDS  # mean simulated seconds between one org's usage/shortage updates
+HEADLESS_ADVANCE_SECONDS = 60.0  # simulated time per advance() when a headless run is bounded only by --duration
+DATA_DIR = "data/sim_data"
+SUPPLY_DEMAND_HISTORY = 50  # snapshots kept in memory
+LOCATION_CLUSTER_SIZE = 5  # most recent post locations kept per category
+SERIES_RESOLUTIONS = [(60, 60), (3600, 24), (86400, 30)]  # (bucket seconds, buckets kept): 1 min for an hour, 1 h for a day, 1 day for a month
+SERIES_LABELS = {60: "1m", 3600: "1h", 86400: "1d"}
+SHORTAGE_WINDOW_SECONDS = 3600  # sliding window behind shortage levels and alerts
+MATCHES_PER_REQUEST = 3
+VOLUNTEERS_PER_CELL = 8  # target density of the volunteer grid
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_SEGMENT_RECORDS = 100_000
+ARCHIVE_DIR = "archive"
+COLUMNAR_DIR = "columnar"
+SQLITE_PATH = "data/posts.db"
+SQLITE_BATCH_RECORDS = 5_000
+ARCHIVE_BATCH_RECORDS = 10_000
+ARCHIVE_SEGMENT_RECORDS = 500_000
+DISTRICT_HALO = 100.0  # volunteers this close to a district edge are shared with its neighbours
+DISTRICT_SYNC_TICKS = 100
+
+# named, seeded presets so runs can be reproduced and compared
+SCENARIOS = {
+    "small": {"num_people": 300, "num_organizations": 15, "activity": 1.0, "seed": 300},
+    "medium": {"num_people": 50_000, "num_organizations": 150, "activity": 20.0, "seed": 50_000},
+    "city": {"num_people": 1_000_000, "num_organizations": 2_000, "activity": 200.0, "seed": 1_000_000}
+}
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -24,32 +71,487 @@ PURPLE = (255, 100, 255)
 ORANGE = (255, 165, 0)
 GRAY = (128, 128, 128)
 
+ORG_COLORS = {
+    "food_bank": GREEN,
+    "shelter": BLUE,
+    "school": YELLOW,
+    "clinic": RED
+}
+LEGEND_ITEMS = [
+    ("Organizations:", BLACK),
+    ("Food Bank", GREEN),
+    ("Shelter", BLUE), 
+    ("School", YELLOW),
+    ("Clinic", RED),
+    ("People:", BLACK),
+    ("Resident", BLACK),
+    ("Volunteer", GREEN),
+    ("Provider", PURPLE),
+    ("Posts:", BLACK),
+    ("Request", RED),
+    ("Offer", GREEN),
+    ("Flagged", ORANGE)
+]
+RECENT_POSTS_SHOWN = 50
+DENSE_POPULATION = 20_000  # above this, people are painted through surfarray instead of draw.circle
+
 class PersonType(Enum):
     RESIDENT = "resident"
     VOLUNTEER = "volunteer"
     ORGANIZATION = "organization"
     PROVIDER = "provider"
 
+PERSON_TYPES = list(PersonType)
+PERSON_TYPE_WEIGHTS = [100, 35, 5, 15]  # num of people there
+SKILLED_PERSON_TYPES = [PERSON_TYPES.index(PersonType.VOLUNTEER), PERSON_TYPES.index(PersonType.PROVIDER)]
+PERSON_COLORS = {
+    PersonType.RESIDENT: BLACK,
+    PersonType.VOLUNTEER: GREEN,
+    PersonType.ORGANIZATION: BLUE,
+    PersonType.PROVIDER: PURPLE
+}
+
 class UrgencyLevel(Enum):
     IMMEDIATE = "Immediate"
     THIS_WEEK = "This week" 
     ANYTIME = "Anytime"
 
-@dataclass
+POST_TYPES = ["offer", "request"]
+OFFER, REQUEST = 0, 1
+CATEGORIES = [
+    "food", "clothing", "housing", "transportation", "childcare",
+    "medical", "education", "employment", "furniture", "technology",
+    "emergency", "mental_health", "elderly_care", "pet_care", "utilities"
+]
+URGENCY_VALUES = [level.value for level in UrgencyLevel]
+SAFETY_FLAGS = default_scanner.flag_types + ["duplicate"]
+DUPLICATE_FLAG = 1 << (len(SAFETY_FLAGS) - 1)
+SAFETY_FLAG_NAMES = [[flag for i, flag in enumerate(SAFETY_FLAGS) if mask >> i & 1] for mask in range(1 << len(SAFETY_FLAGS))]
+SUSPICIOUS_RATE = 0.1  # 10% chance
+DUPLICATE_RATE = 0.08  # 8% chance of duplicate
+DUPLICATE_FLAG_RATE = 0.05  # 5% chance of being flagged as duplicate
+
+OFFER_TITLES = {
+    "food": [
+        "Free groceries available", "Home-cooked meals ready", "Fresh vegetables from garden",
+        "Leftover catering food", "Baby formula available", "Free bread from bakery",
+        "Community soup kitchen", "Fresh fruit pickup", "Pantry cleanout items",
+        "Restaurant surplus food", "Holiday meal preparation", "Bulk rice and beans",
+        "Free lunch for kids", "Farmers market extras", "Meal prep containers",
+        "Homemade preserves", "Free coffee and pastries", "Community potluck leftovers"
+    ],
+    "clothing": [
+        "Winter coats for kids", "Professional attire donation", "Gently used shoes",
+        "Back to school clothes", "Baby clothes 0-2T", "Plus size women's clothing",
+        "Men's work boots size 10-12", "Formal wear for interviews", "Maternity clothes",
+        "Halloween costumes", "Sports uniforms", "Rain gear available",
+        "Designer clothes donation", "Warm blankets and linens", "Undergarments new with tags",
+        "School uniforms", "Vintage clothing lot", "Athletic wear and sneakers"
+    ],
+    "transportation": [
+        "Rides to appointments", "Moving help with truck", "Airport pickup service",
+        "Daily commute carpool", "Grocery store runs", "School pickup/dropoff",
+        "Medical transport", "Job interview rides", "Bus pass donations",
+        "Car repair help", "Jump start service", "Furniture delivery",
+        "Senior citizen rides", "Emergency transportation", "Weekend taxi service",
+        "Bike repair and tune-up", "Moving boxes and supplies", "Gas money assistance"
+    ],
+    "childcare": [
+        "Babysitting services", "After school care", "Weekend childcare",
+        "Date night babysitting", "Emergency childcare", "Summer camp alternative",
+        "Tutoring and homework help", "Newborn care assistance", "Special needs support",
+        "Playdates and activities", "School holiday coverage", "Evening childcare",
+        "Birthday party supervision", "Sick child care", "Single parent support",
+        "Toddler activities", "Teen mentorship", "Art and craft sessions"
+    ],
+    "medical": [
+        "Free health screenings", "Prescription delivery", "Medical equipment loan",
+        "First aid training", "Blood pressure checks", "Mental health counseling",
+        "Dental cleaning vouchers", "Eye exam assistance", "Physical therapy help",
+        "Medical appointment rides", "Health insurance navigation", "Medication management",
+        "Wellness workshops", "Vaccine clinic", "Senior health checks",
+        "Nutrition counseling", "Support group meetings", "Medical bill assistance"
+    ],
+    "education": [
+        "Math tutoring available", "English lessons", "Computer skills help",
+        "SAT prep sessions", "Adult literacy classes", "Job skills training",
+        "Resume writing help", "College application aid", "Language exchange",
+        "Art lessons for kids", "Music instrument lessons", "Science fair help",
+        "Homework club", "Study group formation", "Public speaking practice",
+        "Financial literacy class", "Digital literacy training", "Career counseling"
+    ],
+    "employment": [
+        "Job referral network", "Interview practice", "Professional networking",
+        "Skills training workshop", "Resume review service", "LinkedIn profile help",
+        "Career change guidance", "Freelance opportunities", "Part-time positions",
+        "Work from home jobs", "Apprenticeship programs", "Job fair information",
+        "Professional references", "Industry connections", "Salary negotiation tips",
+        "Portfolio development", "Business startup help", "Professional mentorship"
+    ],
+    "furniture": [
+        "Moving sale everything", "Free dining table", "Kids bedroom set",
+        "Office furniture donation", "Couch and chairs", "Kitchen appliances",
+        "Mattress and box spring", "Bookshelves and storage", "Patio furniture set",
+        "Baby furniture and gear", "Electronics and TV", "Home decor items",
+        "Exercise equipment", "Garden furniture", "Craft supplies lot",
+        "Holiday decorations", "Board games and toys", "Household essentials"
+    ],
+    "technology": [
+        "Free laptop repair", "Phone setup help", "WiFi troubleshooting",
+        "Computer donations", "Tech support for seniors", "Software installation",
+        "Online safety training", "Digital device lessons", "Internet access sharing",
+        "Smartphone tutorials", "Social media setup", "Online banking help",
+        "Video call assistance", "Email account creation", "Password management",
+        "Device data transfer", "App recommendations", "Digital photo organizing"
+    ],
+    "emergency": [
+        "Emergency shelter space", "Crisis support available", "Food bank emergency",
+        "Utility bill assistance", "Rent payment help", "Emergency childcare",
+        "Medical emergency aid", "Transportation to hospital", "Temporary housing",
+        "Storm damage cleanup", "Emergency supplies kit", "Pet emergency care",
+        "Legal emergency help", "Family crisis support", "Disaster relief aid",
+        "Safety planning help", "Emergency contact service", "Crisis intervention"
+    ],
+    "mental_health": [
+        "Peer support meetings", "Anxiety management group", "Grief counseling",
+        "Stress relief workshop", "Meditation sessions", "Support group hosting",
+        "Crisis intervention training", "Wellness check-ins", "Mindfulness practice",
+        "Art therapy sessions", "Music therapy group", "Recovery support",
+        "Teen counseling", "Family therapy", "Trauma support group",
+        "Suicide prevention training", "Mental health first aid", "Self-care workshops"
+    ],
+    "elderly_care": [
+        "Senior companion visits", "Grocery shopping help", "Technology assistance",
+        "Light housekeeping", "Medication reminders", "Doctor appointment rides",
+        "Social activities planning", "Meal preparation", "Pet care for seniors",
+        "Home safety checks", "Bill paying assistance", "Library book delivery",
+        "Garden maintenance", "Letter writing help", "Phone call check-ins",
+        "Exercise programs", "Memory care activities", "Holiday celebration help"
+    ],
+    "pet_care": [
+        "Dog walking service", "Pet sitting available", "Free pet supplies",
+        "Veterinary care vouchers", "Pet grooming help", "Emergency pet care",
+        "Pet training classes", "Animal foster care", "Pet food donations",
+        "Spay/neuter assistance", "Pet adoption events", "Lost pet search help",
+        "Senior pet care", "Special needs pets", "Pet therapy visits",
+        "Animal rescue transport", "Pet photography", "Pet memorial services"
+    ],
+    "utilities": [
+        "Utility bill assistance", "Energy audit help", "Weatherization supplies",
+        "Generator sharing", "Internet access sharing", "Phone service help",
+        "Heating bill relief", "Solar panel information", "Energy saving tips",
+        "Appliance repair", "HVAC maintenance", "Plumbing assistance",
+        "Electrical work help", "Home insulation", "Water conservation tips",
+        "Emergency power backup", "Utility payment plans", "Energy assistance programs"
+    ],
+    "housing": [
+        "Temporary housing", "Room rental offer", "House-sitting available",
+        "Moving assistance", "Home repairs help", "Painting services",
+        "Cleaning services", "Landscaping help", "Security deposit loan",
+        "Roommate matching", "Housing search help", "Lease negotiation",
+        "Home maintenance", "Pest control assistance", "Storage space offer",
+        "Garage cleanout help", "Home organizing", "Furniture assembly"
+    ]
+}
+
+REQUEST_TITLES = {
+    "food": [
+        "Need groceries urgently", "Looking for baby formula", "Food for family of 5",
+        "Emergency food assistance", "School lunch money needed", "Food allergies - need help",
+        "Diabetic meals needed", "Fresh produce wanted", "Thanksgiving meal help",
+        "Baby food and supplies", "Gluten-free options needed", "Halal food sources",
+        "Food stamps application", "Community garden space", "Cooking lessons needed",
+        "Kitchen equipment loan", "Meal delivery help", "Food bank referral"
+    ],
+    "housing": [
+        "Need temporary shelter", "Looking for apartment", "Housing assistance needed",
+        "Eviction prevention help", "Security deposit loan", "Room rental search",
+        "Homeless shelter info", "Moving help needed", "Storage unit rental",
+        "Roommate wanted", "Pet-friendly housing", "Accessible housing search",
+        "Rent payment assistance", "Housing voucher help", "Landlord references",
+        "Lease cosigner needed", "Home repairs urgent", "Utility setup help"
+    ],
+    "medical": [
+        "Need doctor appointment", "Prescription help needed", "Medical transportation",
+        "Health insurance enrollment", "Dental care urgent", "Vision care needed",
+        "Mental health counseling", "Physical therapy access", "Medical equipment needed",
+        "Hospital bill assistance", "Specialist referral needed", "Medical records help",
+        "Wheelchair rental", "Home health aide", "Medication management",
+        "Blood test assistance", "Surgery support needed", "Recovery care help"
+    ],
+    "employment": [
+        "Job search help needed", "Resume assistance urgent", "Interview preparation",
+        "Work clothes needed", "Transportation to work", "Childcare for work",
+        "Job training programs", "Career counseling", "Professional references",
+        "Skills certification help", "Job placement assistance", "Workplace accommodation",
+        "Part-time opportunities", "Remote work setup", "Professional networking",
+        "Business license help", "Freelance guidance", "Unemployment assistance"
+    ],
+    "transportation": [
+        "Need ride to work daily", "Car repair assistance", "Bus pass needed",
+        "Medical appointment ride", "Moving truck rental", "Airport ride needed",
+        "Kids school transport", "Grocery shopping rides", "Job interview transport",
+        "Car insurance help", "Driver's license renewal", "Vehicle registration help",
+        "Gas money assistance", "Parking permit help", "Public transit info",
+        "Bicycle repair needed", "Car seat installation", "Emergency towing"
+    ],
+    "childcare": [
+        "Babysitter needed ASAP", "After school care", "Weekend childcare help",
+        "Special needs childcare", "Newborn help needed", "Summer camp scholarship",
+        "Tutoring for child", "Daycare scholarship", "Emergency babysitting",
+        "Playdate coordination", "Child transportation", "Birthday party help",
+        "Homework assistance", "Bedtime routine help", "Sick child care",
+        "School pickup help", "Teen supervision", "Child activity transport"
+    ],
+    "clothing": [
+        "Winter coats for kids", "Professional attire needed", "School uniforms",
+        "Maternity clothes size L", "Work boots size 11", "Formal dress rental",
+        "Baby clothes 6-12 months", "Plus size clothing", "Rain gear needed",
+        "Athletic wear for teens", "Graduation outfit", "Interview clothes",
+        "Halloween costume help", "Warm blankets needed", "Undergarments needed",
+        "Shoes for growing kids", "Costume for play", "Uniform alterations"
+    ],
+    "furniture": [
+        "Bed and mattress needed", "Kitchen table wanted", "Kids furniture needed",
+        "Moving boxes required", "Refrigerator needed", "Washing machine help",
+        "Couch and chairs", "Office desk needed", "Storage solutions",
+        "Baby crib and supplies", "Wheelchair accessible", "Dining room set",
+        "Bedroom furniture", "Kitchen appliances", "Entertainment center",
+        "Patio furniture", "Exercise equipment", "Home office setup"
+    ],
+    "technology": [
+        "Computer for school", "Internet access needed", "Phone repair help",
+        "Laptop for job search", "WiFi setup assistance", "Tech support needed",
+        "Online learning tools", "Digital literacy help", "Smartphone needed",
+        "Printer for documents", "Software assistance", "Data recovery help",
+        "Video conferencing setup", "Email account help", "Social media guidance",
+        "Online banking setup", "Digital photo help", "App installation"
+    ],
+    "emergency": [
+        "Immediate shelter needed", "Emergency food now", "Crisis intervention",
+        "Utility shutoff help", "Rent due tomorrow", "Medical emergency",
+        "Domestic violence help", "Homeless tonight", "Emergency childcare",
+        "Pet emergency care", "Transportation crisis", "Legal emergency",
+        "Mental health crisis", "Family emergency", "Natural disaster aid",
+        "Safety planning help", "Emergency supplies", "Immediate cash help"
+    ],
+    "mental_health": [
+        "Counseling services needed", "Support group access", "Crisis intervention",
+        "Anxiety help urgent", "Depression support", "Trauma counseling",
+        "Addiction recovery", "Family therapy needed", "Teen counseling",
+        "Grief support group", "Stress management", "Anger management",
+        "Eating disorder help", "PTSD treatment", "Bipolar support",
+        "Suicide prevention help", "Self-harm support", "Mental health advocate"
+    ],
+    "elderly_care": [
+        "Senior care needed", "Companion for elderly", "Medical rides for senior",
+        "Grocery shopping help", "Medication management", "Home safety check",
+        "Social visits needed", "Technology help for senior", "Meal preparation",
+        "Light housekeeping", "Pet care for elderly", "Bill paying help",
+        "Garden maintenance", "Transportation to activities", "Health monitoring",
+        "Emergency contact needed", "Memory care support", "Exercise companion"
+    ],
+    "pet_care": [
+        "Dog walker needed", "Pet sitting urgent", "Veterinary care help",
+        "Pet food assistance", "Emergency pet care", "Pet grooming help",
+        "Animal foster needed", "Lost pet search", "Pet supplies needed",
+        "Spay/neuter assistance", "Pet training help", "Senior pet care",
+        "Special needs pet", "Pet medication help", "Animal transport",
+        "Pet boarding needed", "Vet bill assistance", "Pet behavioral help"
+    ],
+    "utilities": [
+        "Electric bill help", "Heat shutoff notice", "Internet service needed",
+        "Phone service help", "Water bill assistance", "Gas bill overdue",
+        "Energy assistance needed", "Utility deposit help", "Service restoration",
+        "Weatherization help", "Appliance repair", "HVAC assistance",
+        "Plumbing emergency", "Electrical work needed", "Home insulation",
+        "Energy audit needed", "Solar information", "Generator rental"
+    ],
+    "education": [
+        "Tutoring needed", "School supplies help", "College application aid",
+        "Adult education classes", "GED preparation", "Language learning",
+        "Computer literacy", "Job skills training", "Scholarship information",
+        "School lunch assistance", "Transportation to school", "Homework help",
+        "Study group needed", "Test preparation", "Career counseling",
+        "Library card help", "Educational supplies", "Learning disability support"
+    ]
+}
+
+# potential safety issues
+BASE_DESCRIPTIONS = {
+    "offer": [
+        "Available to help with {category} in our community",
+        "Happy to provide {category} support to neighbors in need",
+        "Offering {category} assistance - please reach out",
+        "Community member willing to help with {category}",
+        "Local {category} support available",
+        "Sharing resources for {category} needs",
+        "Volunteer help available for {category}",
+        "No cost {category} assistance offered"
+    ],
+    "request": [
+        "Seeking help with {category} situation",
+        "Family needs assistance with {category}",
+        "Looking for {category} support in our area",
+        "Could use community help with {category}",
+        "Requesting {category} assistance",
+        "In need of {category} help",
+        "Struggling with {category} - need support",
+        "Emergency {category} assistance needed"
+    ]
+}
+
+SUSPICIOUS_ADDITIONS = [
+    " Send cash payment upfront! No questions asked!",
+    " Meet me alone in parking lot after dark",
+    " Click this suspicious link for amazing deals!!!",
+    " Wire money immediately or offer expires",
+    " Must have your social security number first",
+    " Bring all your personal documents to meet",
+    " Only contact through encrypted messaging app",
+    " No phone calls, cash only transactions",
+    " Delete this message after reading",
+    " Urgent - government assistance available (fake)",
+    " Collect personal information for verification",
+    " Request bank account details for payment"
+]
+
+URGENCY_WEIGHTS = {
+    "emergency": [0.7, 0.2, 0.1],
+    "medical": [0.5, 0.3, 0.2], 
+    "food": [0.3, 0.4, 0.3],
+    "housing": [0.4, 0.4, 0.2]
+}
+DEFAULT_URGENCY_WEIGHTS = [0.2, 0.3, 0.5]
+
+
+class PostTemplateCatalog:
+    # post text templates, expanded once per category at startup instead of on every post
+    def __init__(self, offer_titles: dict, request_titles: dict, descriptions: dict, suspicious_additions: List[str],
+                 urgency_weights: dict, default_urgency_weights: List[float]):
+        self.offer_titles = offer_titles
+        self.request_titles = request_titles
+        self.base_descriptions = descriptions
+        self.suspicious_additions = suspicious_additions
+        self.urgency_weights = urgency_weights
+        self.default_urgency_weights = default_urgency_weights
+        self.categories = None
+
+    @classmethod
+    def default(cls) -> "PostTemplateCatalog":
+        return cls(OFFER_TITLES, REQUEST_TITLES, BASE_DESCRIPTIONS, SUSPICIOUS_ADDITIONS, URGENCY_WEIGHTS, DEFAULT_URGENCY_WEIGHTS)
+
+    @classmethod
+    def load(cls, path: str) -> "PostTemplateCatalog":
+        # same keys as to_dict(); anything missing falls back to the built-in templates
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(
+            offer_titles=data.get("offer_titles", OFFER_TITLES),
+            request_titles=data.get("request_titles", REQUEST_TITLES),
+            descriptions=data.get("descriptions", BASE_DESCRIPTIONS),
+            suspicious_additions=data.get("suspicious_additions", SUSPICIOUS_ADDITIONS),
+            urgency_weights=data.get("urgency_weights", URGENCY_WEIGHTS),
+            default_urgency_weights=data.get("default_urgency_weights", DEFAULT_URGENCY_WEIGHTS)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "offer_titles": self.offer_titles,
+            "request_titles": self.request_titles,
+            "descriptions": self.base_descriptions,
+            "suspicious_additions": self.suspicious_additions,
+            "urgency_weights": self.urgency_weights,
+            "default_urgency_weights": self.default_urgency_weights
+        }
+
+    def compile(self, categories: List[str]) -> "PostTemplateCatalog":
+        # tables are indexed [title kind or post type][category][template][suspicious addition]
+        self.categories = categories
+        self.titles = [
+            [titles.get(category) or [f"{kind.title()} for {category}"] for category in categories]
+            for kind, titles in zip(POST_TYPES, (self.offer_titles, self.request_titles))
+        ]
+        self.descriptions = [
+            [[template.format(category=category) for template in self.base_descriptions[post_type]] for category in categories]
+            for post_type in POST_TYPES
+        ]
+        endings = [""] + list(self.suspicious_additions)
+        self.full_descriptions = [
+            [[[description + ending for ending in endings] for description in per_category] for per_category in per_type]
+            for per_type in self.descriptions
+        ]
+        self.description_flags = [
+            [[[default_scanner.mask(text) for text in variants] for variants in per_category] for per_category in per_type]
+            for per_type in self.full_descriptions
+        ]
+
+        self.title_counts = np.array([[len(titles) for titles in per_kind] for per_kind in self.titles], dtype=np.int64)
+        self.description_counts = np.array([[len(d) for d in per_type] for per_type in self.descriptions], dtype=np.int64)
+        weights = np.array([self.urgency_weights.get(category, self.default_urgency_weights) for category in categories], dtype=np.float64)
+        self.urgency_cum_weights_array = np.cumsum(weights / weights.sum(axis=1, keepdims=True), axis=1)
+        self.urgency_cum_weights = self.urgency_cum_weights_array.tolist()
+        return self
+
+@dataclass(slots=True)
 class Post:
+    # categorical fields are small-int codes into POST_TYPES/CATEGORIES/URGENCY_VALUES, the timestamp is
+    # epoch seconds and safety flags are a SAFETY_FLAGS bitmask; the properties give the old string views
     id: int
     user_id: int
-    post_type: str  # "offer" or "request"
-    category: str
+    type_code: int
+    category_code: int
     title: str
     description: str
-    urgency: str
-    location: tuple
-    timestamp: str
-    safety_flags: List[str]
+    urgency_code: int
+    x: float
+    y: float
+    created_at: float
+    flags: int
     is_duplicate: bool
     user_reputation: float
 
+    @property
+    def post_type(self) -> str:
+        return POST_TYPES[self.type_code]
+
+    @property
+    def category(self) -> str:
+        return CATEGORIES[self.category_code]
+
+    @property
+    def urgency(self) -> str:
+        return URGENCY_VALUES[self.urgency_code]
+
+    @property
+    def location(self) -> tuple:
+        return (self.x, self.y)
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.created_at).isoformat()
+
+    @property
+    def safety_flags(self) -> List[str]:
+        return list(SAFETY_FLAG_NAMES[self.flags])
+
+    def to_dict(self) -> dict:
+        # same keys and values the old asdict(post) export produced
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "post_type": POST_TYPES[self.type_code],
+            "category": CATEGORIES[self.category_code],
+            "title": self.title,
+            "description": self.description,
+            "urgency": URGENCY_VALUES[self.urgency_code],
+            "location": (self.x, self.y),
+            "timestamp": datetime.fromtimestamp(self.created_at).isoformat(),
+            "safety_flags": list(SAFETY_FLAG_NAMES[self.flags]),
+            "is_duplicate": self.is_duplicate,
+            "user_reputation": self.user_reputation
+        }
+
 @dataclass
 class Person:
     id: int
@@ -63,6 +565,178 @@ class Person:
     posts_created: int
     safety_score: float
     
+
+def mask_to_names(mask: int, names: List[str]) -> List[str]:
+    return [name for bit, name in enumerate(names) if mask >> bit & 1]
+
+
+def sample_masks(rng: np.random.Generator, size: int, num_items: int, low: int, high: int, chunk: int = 100_000) -> np.ndarray:
+    # bitmask of k distinct items per row, k uniform in [low, high]
+    masks = np.zeros(size, dtype=np.uint32)
+    weights = (np.uint32(1) << np.arange(num_items, dtype=np.uint32))
+    for start in range(0, size, chunk):
+        stop = min(start + chunk, size)
+        keys = rng.random((stop - start, num_items), dtype=np.float32)
+        k = rng.integers(low, high + 1, size=stop - start)
+        ranks = keys.argsort(axis=1).argsort(axis=1)
+        chosen = ranks < k[:, None]
+        masks[start:stop] = (chosen * weights).sum(axis=1, dtype=np.uint32)
+    return masks
+
+
+class Population:
+    # struct-of-arrays store: one numpy column per Person field, skills/needs as bitmasks
+    def __init__(self, size: int, skills: List[str], categories: List[str]):
+        self.skills = skills
+        self.categories = categories
+        self.id = np.arange(1, size + 1, dtype=np.int64)
+        self.person_type = np.zeros(size, dtype=np.int8)
+        self.x = np.zeros(size, dtype=np.float64)
+        self.y = np.zeros(size, dtype=np.float64)
+        self.skill_mask = np.zeros(size, dtype=np.uint32)
+        self.need_mask = np.zeros(size, dtype=np.uint32)
+        self.reputation = np.zeros(size, dtype=np.float64)
+        self.safety_score = np.zeros(size, dtype=np.float64)
+        self.posts_created = np.zeros(size, dtype=np.int32)
+        self.post_rate = np.zeros(size, dtype=np.float32)  # relative posting rate, scaled by the town-wide rate
+        self._id_order = None
+
+    @classmethod
+    def generate(cls, size: int, skills: List[str], categories: List[str], rng: np.random.Generator) -> "Population":
+        population = cls(size, skills, categories)
+        weights = np.array(PERSON_TYPE_WEIGHTS, dtype=np.float64)
+        population.person_type[:] = rng.choice(len(PERSON_TYPES), size=size, p=weights / weights.sum())
+        population.x[:] = rng.uniform(50, WINDOW_WIDTH-50, size=size)
+        population.y[:] = rng.uniform(50, WINDOW_HEIGHT-50, size=size)
+
+        skilled = np.isin(population.person_type, SKILLED_PERSON_TYPES)
+        population.skill_mask[skilled] = sample_masks(rng, int(skilled.sum()), len(skills), 1, 4)
+        population.need_mask[:] = sample_masks(rng, size, len(categories), 0, 3)
+
+        population.reputation[:] = rng.uniform(0.1, 1.0, size=size)
+        population.safety_score[:] = rng.uniform(0.5, 1.0, size=size)
+        population.post_rate[:] = rng.gamma(POST_RATE_SHAPE, 1.0 / POST_RATE_SHAPE, size=size)
+        return population
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self.person(idx)
+
+    def index_of(self, person_id: int) -> int:
+        # binary search over the sorted ids doubles as the id -> person map
+        if self._id_order is None:
+            self._id_order = np.argsort(self.id, kind="stable")
+            self._sorted_id = self.id[self._id_order]
+        pos = int(np.searchsorted(self._sorted_id, person_id))
+        if pos < len(self._sorted_id) and self._sorted_id[pos] == person_id:
+            return int(self._id_order[pos])
+        return -1
+
+    def columns(self) -> dict:
+        return {
+            "id": self.id, "person_type": self.person_type, "x": self.x, "y": self.y,
+            "skill_mask": self.skill_mask, "need_mask": self.need_mask, "reputation": self.reputation,
+            "safety_score": self.safety_score, "posts_created": self.posts_created, "post_rate": self.post_rate
+        }
+
+    def subset(self, indices: np.ndarray) -> "Population":
+        population = Population(0, self.skills, self.categories)
+        for name, column in self.columns().items():
+            setattr(population, name, column[indices].copy())
+        return population
+
+    @classmethod
+    def concat(cls, parts: List["Population"]) -> "Population":
+        population = cls(0, parts[0].skills, parts[0].categories)
+        for name in population.columns():
+            setattr(population, name, np.concatenate([getattr(part, name) for part in parts]))
+        return population
+
+    def indices_of_type(self, person_type: PersonType) -> np.ndarray:
+        return np.flatnonzero(self.person_type == PERSON_TYPES.index(person_type))
+
+    def person(self, idx: int) -> Person:
+        person_id = int(self.id[idx])
+        return Person(
+            id=person_id,
+            name=f"Person_{person_id}",
+            person_type=PERSON_TYPES[self.person_type[idx]],
+            x=float(self.x[idx]),
+            y=float(self.y[idx]),
+            skills=mask_to_names(int(self.skill_mask[idx]), self.skills),
+            needs=mask_to_names(int(self.need_mask[idx]), self.categories),
+            reputation=float(self.reputation[idx]),
+            posts_created=int(self.posts_created[idx]),
+            safety_score=float(self.safety_score[idx])
+        )
+
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self.columns().values())
+
+class VolunteerIndex:
+    # uniform grid over volunteer locations, stored CSR-style (volunteers sorted by cell)
+    def __init__(self, population: Population, indices: np.ndarray, bounds: tuple = (0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)):
+        self.population = population
+        self.x0, self.y0 = bounds[0], bounds[1]
+        width, height = bounds[2] - bounds[0], bounds[3] - bounds[1]
+        self.cell_size = max(1.0, math.sqrt(width * height * VOLUNTEERS_PER_CELL / max(len(indices), 1)))
+        self.cols = int(width // self.cell_size) + 1
+        self.rows = int(height // self.cell_size) + 1
+
+        cells = self._cell_of(population.x[indices], population.y[indices])
+        order = np.argsort(cells, kind="stable")
+        self.indices = indices[order]
+        self.x = population.x[self.indices]
+        self.y = population.y[self.indices]
+        self.skill_mask = population.skill_mask[self.indices]
+        self.reputation = population.reputation[self.indices]
+        self.cell_start = np.searchsorted(cells[order], np.arange(self.cols * self.rows + 1))
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def _cell_of(self, x, y):
+        col = np.clip(((x - self.x0) // self.cell_size).astype(np.int64), 0, self.cols - 1)
+        row = np.clip(((y - self.y0) // self.cell_size).astype(np.int64), 0, self.rows - 1)
+        return row * self.cols + col
+
+    def _ring(self, col: int, row: int, radius: int) -> np.ndarray:
+        if radius == 0:
+            cells = [(col, row)]
+        else:
+            cells = [(col + dx, row + dy) for dx in range(-radius, radius + 1) for dy in (-radius, radius)]
+            cells += [(col + dx, row + dy) for dx in (-radius, radius) for dy in range(-radius + 1, radius)]
+        slices = [
+            np.arange(self.cell_start[r * self.cols + c], self.cell_start[r * self.cols + c + 1])
+            for c, r in cells if 0 <= c < self.cols and 0 <= r < self.rows
+        ]
+        return np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+
+    def nearest(self, x: float, y: float, skill_mask: int, k: int = MATCHES_PER_REQUEST) -> List[tuple]:
+        # k nearest volunteers sharing a skill with skill_mask, as (distance, -reputation, person index)
+        col = min(max(int((x - self.x0) // self.cell_size), 0), self.cols - 1)
+        row = min(max(int((y - self.y0) // self.cell_size), 0), self.rows - 1)
+        max_radius = max(col, row, self.cols - 1 - col, self.rows - 1 - row)
+
+        found = []
+        for radius in range(max_radius + 1):
+            slots = self._ring(col, row, radius)
+            if len(slots):
+                slots = slots[(self.skill_mask[slots] & skill_mask) != 0]
+            if len(slots):
+                distances = np.hypot(self.x[slots] - x, self.y[slots] - y)
+                found.extend(zip(distances.tolist(), (-self.reputation[slots]).tolist(), self.indices[slots].tolist()))
+            # anything in the next ring is at least radius * cell_size away
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= radius * self.cell_size:
+                    break
+        found.sort()
+        return found[:k]
+
 @dataclass
 class Organization:
     id: int
@@ -84,33 +758,627 @@ class SupplyDemandData:
     shortage_level: float
     timestamp: str
     location_clusters: List[tuple]
+    window_seconds: float
+    window_offers: int
+    window_requests: int
+    offers_per_hour: float
+    requests_per_hour: float
 
-class TownSimulation:
+
+class CategoryTimeSeries:
+    # per-category offer/request counts in tumbling buckets at several resolutions; each level is a
+    # ring buffer, so an append is O(1) and older history survives only at the coarser resolutions
+    def __init__(self, num_categories: int, resolutions: List[tuple] = SERIES_RESOLUTIONS):
+        self.resolutions = resolutions
+        self.counts = [np.zeros((buckets, len(POST_TYPES), num_categories), dtype=np.int64) for _, buckets in resolutions]
+        self.head = [0] * len(resolutions)  # absolute bucket number of each level's newest bucket
+        self.time = 0.0
+
+    def advance_to(self, t: float):
+        # rolls every level forward to the bucket holding t, clearing the buckets it wraps over
+        if t <= self.time:
+            return
+        self.time = t
+        for level, (width, buckets) in enumerate(self.resolutions):
+            bucket = int(t // width)
+            head = self.head[level]
+            if bucket == head:
+                continue
+            counts = self.counts[level]
+            if bucket - head >= buckets:
+                counts[:] = 0
+            else:
+                counts[np.arange(head + 1, bucket + 1) % buckets] = 0
+            self.head[level] = bucket
+
+    def add_many(self, times: np.ndarray, post_types: np.ndarray, categories: np.ndarray):
+        # times must be sorted and not older than the series; rolling forward to the last one first
+        # means every bucket the batch touches is either still live or was just cleared
+        self.advance_to(float(times[-1]))
+        for level, (width, buckets) in enumerate(self.resolutions):
+            bucket = (times // width).astype(np.int64)
+            live = bucket > self.head[level] - buckets
+            np.add.at(self.counts[level], (bucket[live] % buckets, post_types[live], categories[live]), 1)
+
+    def window(self, seconds: float) -> np.ndarray:
+        # sliding window ending now, rounded up to whole buckets of the finest level that spans it;
+        # returns counts shaped (post type, category)
+        for level, (width, buckets) in enumerate(self.resolutions):
+            if width * buckets >= seconds or level == len(self.resolutions) - 1:
+                break
+        n = min(int(math.ceil(seconds / width)), buckets, self.head[level] + 1)
+        return self.counts[level][(self.head[level] - np.arange(n)) % buckets].sum(axis=0)
+
+    def buckets(self, level: int) -> tuple:
+        # (bucket start times, counts) oldest first, for the buckets this level still holds
+        width, buckets = self.resolutions[level]
+        head = self.head[level]
+        numbers = np.arange(max(0, head - buckets + 1), head + 1)
+        return numbers * width, self.counts[level][numbers % buckets]
+
+    @classmethod
+    def merge(cls, parts: List["CategoryTimeSeries"]) -> "CategoryTimeSeries":
+        # districts share one clock, so their rings line up bucket for bucket
+        series = cls(parts[0].counts[0].shape[2], parts[0].resolutions)
+        series.counts = [sum(part.counts[level] for part in parts) for level in range(len(series.resolutions))]
+        series.head = list(parts[0].head)
+        series.time = max(part.time for part in parts)
+        return series
+
+def make_run_directory(parent: str) -> tuple:
+    # a fresh directory per run, named by start time (microseconds); runs that still collide get a
+    # numeric suffix instead of writing into each other's files
+    run_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    os.makedirs(parent, exist_ok=True)
+    for attempt in itertools.count():
+        name = run_id if attempt == 0 else f"{run_id}-{attempt}"
+        try:
+            os.mkdir(os.path.join(parent, name))
+            return name, os.path.join(parent, name)
+        except FileExistsError:
+            continue
+
+
+class CheckpointWriter:
+    # append-only checkpoints: each save appends only what is new to NDJSON segments + a small manifest
+    def __init__(self, directory: str, segment_records: int = CHECKPOINT_SEGMENT_RECORDS):
+        self.run_id, self.directory = make_run_directory(directory)
+        self.segment_records = segment_records
+
+        self.manifest = {
+            "run_id": self.run_id,
+            "created_at": datetime.now().isoformat(),
+            "updated_at": None,
+            "checkpoints": 0,
+            "last_post_id": 0,
+            "last_match_post_id": 0,
+            "snapshot_seq": 0,
+            "streams": {}
+        }
+
+    def append(self, stream: str, records: List[dict]):
+        if not records:
+            return
+        info = self.manifest["streams"].setdefault(stream, {"records": 0, "segments": []})
+        start = 0
+        while start < len(records):
+            segments = info["segments"]
+            if not segments or segments[-1]["records"] >= self.segment_records:
+                segments.append({"file": f"{stream}-{len(segments):05d}.ndjson", "records": 0})
+            segment = segments[-1]
+            batch = records[start:start + self.segment_records - segment["records"]]
+            with open(os.path.join(self.directory, segment["file"]), "a") as f:
+                f.writelines(json.dumps(record, default=str) + "\n" for record in batch)
+            segment["records"] += len(batch)
+            info["records"] += len(batch)
+            start += len(batch)
+
+    def append_posts(self, posts: List[Post]):
+        # posts must be in id order; anything already checkpointed is skipped
+        records = [post.to_dict() for post in posts if post.id > self.manifest["last_post_id"]]
+        self.append("posts", records)
+        if records:
+            self.manifest["last_post_id"] = records[-1]["id"]
+
+    def append_matches(self, matches: List[dict]):
+        # matches are made once per request and never change, so like posts they are appended in
+        # post id order and anything already checkpointed is skipped
+        records = [match for match in matches if match["post_id"] > self.manifest["last_match_post_id"]]
+        self.append("matches", records)
+        if records:
+            self.manifest["last_match_post_id"] = records[-1]["post_id"]
+
+    def write(self, simulation: "TownSimulation"):
+        manifest = self.manifest
+
+        new_posts = []
+        for post in reversed(simulation.posts):
+            if post.id <= manifest["last_post_id"]:
+                break
+            new_posts.append(post)
+        new_posts.reverse()
+        self.append_posts(new_posts)
+
+        new_matches = []
+        for match in reversed(simulation.volunteer_matches):
+            if match["post_id"] <= manifest["last_match_post_id"]:
+                break
+            new_matches.append(match)
+        new_matches.reverse()
+        self.append_matches(new_matches)
+
+        new_snapshots = simulation.supply_demand_seq - manifest["snapshot_seq"]
+        if new_snapshots:
+            count = min(new_snapshots * len(simulation.categories), len(simulation.supply_demand_data))
+            history = simulation.supply_demand_data
+            self.append("supply_demand", [asdict(history[i]) for i in range(len(history) - count, len(history))])
+            manifest["snapshot_seq"] = simulation.supply_demand_seq
+
+        manifest["checkpoints"] += 1
+        manifest["updated_at"] = datetime.now().isoformat()
+        manifest_path = os.path.join(self.directory, "manifest.json")
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+
+class EventQueue:
+    # min-heap of (time, seq, kind, arg); seq keeps same-time events in scheduling order
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Community Town Simulation")
-        self.clock = pygame.time.Clock()
+        self.heap = []
+        self.seq = 0
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, event_time: float, kind: str, arg=None):
+        heapq.heappush(self.heap, (event_time, self.seq, kind, arg))
+        self.seq += 1
+
+    def next_time(self) -> float:
+        return self.heap[0][0] if self.heap else math.inf
+
+    def pop(self) -> tuple:
+        event_time, _, kind, arg = heapq.heappop(self.heap)
+        return event_time, kind, arg
+
+
+@dataclass
+class RetentionPolicy:
+    # None means unbounded; evicted posts are archived, not dropped
+    max_posts: Optional[int] = None
+    max_age_seconds: Optional[float] = None
+
+
+class PostArchive:
+    # gzip-compressed NDJSON segments for posts evicted from memory
+    def __init__(self, directory: str, segment_records: int = ARCHIVE_SEGMENT_RECORDS):
+        self.parent = directory
+        self.directory = None  # created on the first flush
+        self.segment_records = segment_records
+        self.pending = []
+        self.segment = 0
+        self.segment_count = 0
+        self.archived = 0
+        # posts are added on the frame thread and flushed by the background snapshot writer too;
+        # pending_lock guards the buffer, write_lock keeps segments appended in post order
+        self.pending_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+
+    def add(self, posts: List[Post]):
+        with self.pending_lock:
+            self.pending.extend(posts)
+            self.archived += len(posts)
+            full = len(self.pending) >= ARCHIVE_BATCH_RECORDS
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.write_lock:
+            with self.pending_lock:
+                pending, self.pending = self.pending, []
+            if not pending:
+                return
+            if self.directory is None:
+                _, self.directory = make_run_directory(self.parent)
+            start = 0
+            while start < len(pending):
+                if self.segment_count >= self.segment_records:
+                    self.segment += 1
+                    self.segment_count = 0
+                batch = pending[start:start + self.segment_records - self.segment_count]
+                path = os.path.join(self.directory, f"posts-{self.segment:05d}.ndjson.gz")
+                with gzip.open(path, "at") as f:
+                    f.writelines(json.dumps(post.to_dict()) + "\n" for post in batch)
+                self.segment_count += len(batch)
+                start += len(batch)
+
+
+class SQLiteSink:
+    # streams posts, organizations and matches into SQLite (WAL mode); posts are buffered and written
+    # in batched transactions. Ids restart at 1 every run, so every row is keyed by (run_id, id) and
+    # several runs can share one database without overwriting each other
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY, started_at TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS posts (
+            run_id TEXT, id INTEGER, user_id INTEGER, post_type TEXT, category TEXT, title TEXT,
+            description TEXT, urgency TEXT, x REAL, y REAL, timestamp TEXT, safety_flags TEXT,
+            is_duplicate INTEGER, user_reputation REAL, PRIMARY KEY (run_id, id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS organizations (
+            run_id TEXT, id INTEGER, name TEXT, org_type TEXT, x REAL, y REAL, capacity INTEGER,
+            current_usage INTEGER, operating_hours TEXT, current_shortages TEXT, services TEXT, updated_at TEXT,
+            PRIMARY KEY (run_id, id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS matches (
+            run_id TEXT, post_id INTEGER, seeker_id INTEGER, category TEXT, urgency TEXT,
+            match_score REAL, matched_volunteers TEXT, timestamp TEXT, PRIMARY KEY (run_id, post_id)
+        )""",
+        "CREATE INDEX IF NOT EXISTS posts_category ON posts (run_id, category)",
+        "CREATE INDEX IF NOT EXISTS posts_post_type ON posts (run_id, post_type)",
+        "CREATE INDEX IF NOT EXISTS posts_user_id ON posts (run_id, user_id)",
+        "CREATE INDEX IF NOT EXISTS posts_timestamp ON posts (run_id, timestamp)",
+        "CREATE INDEX IF NOT EXISTS matches_category ON matches (run_id, category)"
+    ]
+
+    def __init__(self, path: str, batch_records: int = SQLITE_BATCH_RECORDS, run_id: str = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.batch_records = batch_records
+        self.run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S%f")
+        # also used from the background snapshot writer; every use of the connection holds write_lock
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(posts)")]
+        if columns and "run_id" not in columns:
+            self.connection.close()
+            raise ValueError(f"{path} has posts without a run_id column (written by an older sim.py); "
+                             "remove it or pass another --sqlite path")
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with self.connection:
+                for statement in self.SCHEMA:
+                    self.connection.execute(statement)
+                self.connection.execute("INSERT INTO runs VALUES (?, ?)", (self.run_id, datetime.now().isoformat()))
+        except sqlite3.IntegrityError:
+            self.connection.close()
+            raise ValueError(f"run {self.run_id!r} is already in {path}")
+        self.pending = []
+        self.last_match_post_id = 0
+        self.written_posts = 0
+        self.pending_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+
+    def add(self, post: Post):
+        with self.pending_lock:
+            self.pending.append(post)
+            full = len(self.pending) >= self.batch_records
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.write_lock:
+            self._flush()
+
+    def _flush(self):
+        with self.pending_lock:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return
+        rows = [
+            (
+                self.run_id, record["id"], record["user_id"], record["post_type"], record["category"], record["title"],
+                record["description"], record["urgency"], record["location"][0], record["location"][1],
+                record["timestamp"], json.dumps(record["safety_flags"]), record["is_duplicate"], record["user_reputation"]
+            )
+            for record in (post.to_dict() for post in pending)
+        ]
+        with self.connection:
+            self.connection.executemany("INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.written_posts += len(rows)
+
+    def add_matches(self, matches: List[dict]):
+        with self.write_lock:
+            self._add_matches(matches)
+
+    def _add_matches(self, matches: List[dict]):
+        # a match never changes once made, so each is written once, in post id order
+        rows = [
+            (
+                self.run_id, match["post_id"], match["seeker_id"], match["category"], match["urgency"],
+                match["match_score"], json.dumps(match["matched_volunteers"]), match["timestamp"]
+            )
+            for match in matches if match["post_id"] > self.last_match_post_id
+        ]
+        if not rows:
+            return
+        with self.connection:
+            self.connection.executemany("INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.last_match_post_id = rows[-1][1]
+
+    def write(self, simulation: "TownSimulation"):
+        with self.write_lock:
+            self._write(simulation)
+
+    def _write(self, simulation: "TownSimulation"):
+        self._flush()
+        updated_at = datetime.now().isoformat()
+        organizations = [
+            (
+                self.run_id, org.id, org.name, org.org_type, org.x, org.y, org.capacity, org.current_usage, org.operating_hours,
+                json.dumps(org.current_shortages), json.dumps(org.services), updated_at
+            )
+            for org in simulation.organizations
+        ]
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO organizations VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", organizations)
+        new_matches = []
+        for match in reversed(simulation.volunteer_matches):
+            if match["post_id"] <= self.last_match_post_id:
+                break
+            new_matches.append(match)
+        new_matches.reverse()
+        self._add_matches(new_matches)
+
+    def close(self):
+        with self.write_lock:
+            self._flush()
+            self.connection.close()
+
+
+@dataclass
+class RenderSnapshot:
+    # everything the renderer reads, captured between simulation steps
+    people: "Population"
+    org_version: int
+    organizations: List[tuple]  # (org_type, x, y, current_usage, capacity)
+    recent_posts: List[tuple]  # (x, y, post_type, flagged)
+    total_posts: int
+    total_matches: int
+
+
+class GlyphCache:
+    # renders each character once; text is blitted glyph by glyph
+    def __init__(self, font):
+        self.font = font
+        self.glyphs = {}
+
+    def glyph(self, char: str, color: tuple):
+        key = (char, color)
+        surface = self.glyphs.get(key)
+        if surface is None:
+            surface = self.font.render(char, True, color)
+            self.glyphs[key] = surface
+        return surface
+
+    def blit(self, target, text: str, pos: tuple, color: tuple = BLACK):
+        x, y = pos
+        height = 0
+        for char in text:
+            surface = self.glyph(char, color)
+            target.blit(surface, (x, y))
+            x += surface.get_width()
+            height = max(height, surface.get_height())
+        return pygame.Rect(pos[0], y, x - pos[0], height)
+
+
+class TownRenderer:
+    # layered renderer: a cached base layer (orgs, people, legend) is rebuilt only when orgs or
+    # people change; between rebuilds only the post dots and stats are redrawn as dirty rects
+    def __init__(self, screen):
+        self.screen = screen
+        self.font = pygame.font.Font(None, 24)
+        self.glyphs = GlyphCache(self.font)
+        self.legend = self._render_legend()
+        self.people_layer = None
+        self.people_key = None
+        self.base = None
+        self.base_key = None
+        self.dirty = []
+
+    def _render_legend(self):
+        legend = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        legend.fill(WHITE)
+        legend.set_colorkey(WHITE)
+        legend_y = 10
+        x_offset = 10
+        for i, (text, color) in enumerate(LEGEND_ITEMS):
+            if i > 0 and i % 7 == 0:
+                x_offset += 150
+                legend_y = 10
+            legend.blit(self.font.render(text, True, color), (x_offset, legend_y))
+            legend_y += 25
+        return legend
+
+    def _render_people(self, people: Population):
+        layer = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        layer.fill(WHITE)
+        layer.set_colorkey(WHITE)
+        palette = np.array([PERSON_COLORS.get(person_type, GRAY) for person_type in PERSON_TYPES], dtype=np.uint8)
+
+        if len(people) > DENSE_POPULATION:
+            xs = np.clip(people.x.astype(np.int64), 0, WINDOW_WIDTH - 1)
+            ys = np.clip(people.y.astype(np.int64), 0, WINDOW_HEIGHT - 1)
+            colors = palette[people.person_type]
+            pixels = pygame.surfarray.pixels3d(layer)
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    pixels[np.clip(xs + dx, 0, WINDOW_WIDTH - 1), np.clip(ys + dy, 0, WINDOW_HEIGHT - 1)] = colors
+            del pixels  # unlocks the surface
+        else:
+            xs = people.x.astype(np.int32).tolist()
+            ys = people.y.astype(np.int32).tolist()
+            for x, y, type_code in zip(xs, ys, people.person_type.tolist()):
+                pygame.draw.circle(layer, tuple(palette[type_code].tolist()), (x, y), 3)
+        return layer
+
+    def _render_base(self, snapshot: RenderSnapshot):
+        base = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+        base.fill(WHITE)
+        for org_type, x, y, current_usage, capacity in snapshot.organizations:
+            color = ORG_COLORS.get(org_type, GRAY)
+            pygame.draw.rect(base, color, (x-10, y-10, 20, 20))
+            
+            capacity_ratio = current_usage / capacity
+            bar_width = 30
+            bar_height = 5
+            pygame.draw.rect(base, BLACK, (x-15, y+15, bar_width, bar_height))
+            pygame.draw.rect(base, RED if capacity_ratio > 0.8 else GREEN, 
+                           (x-15, y+15, bar_width * capacity_ratio, bar_height))
+        base.blit(self.people_layer, (0, 0))
+        base.blit(self.legend, (0, 0))
+        return base
+
+    def draw(self, snapshot: RenderSnapshot):
+        people_key = (id(snapshot.people), len(snapshot.people))
+        if people_key != self.people_key:
+            self.people_layer = self._render_people(snapshot.people)
+            self.people_key = people_key
+            self.base_key = None
+
+        full_redraw = False
+        base_key = snapshot.org_version
+        if base_key != self.base_key:
+            self.base = self._render_base(snapshot)
+            self.base_key = base_key
+            full_redraw = True
+
+        if full_redraw:
+            self.screen.blit(self.base, (0, 0))
+        else:
+            for rect in self.dirty:
+                self.screen.blit(self.base, rect, rect)
+
+        dirty = []
+        for x, y, post_type, flagged in snapshot.recent_posts:
+            color = RED if post_type == "request" else GREEN
+            if flagged:
+                color = ORANGE
+            dirty.append(pygame.draw.circle(self.screen, color, (int(x), int(y)), 2))
+
+        stats_y = WINDOW_HEIGHT - 100
+        stats = [
+            f"People: {len(snapshot.people)}",
+            f"Organizations: {len(snapshot.organizations)}", 
+            f"Posts: {snapshot.total_posts}",
+            f"Matches: {snapshot.total_matches}"
+        ]
+        for i, stat in enumerate(stats):
+            dirty.append(self.glyphs.blit(self.screen, stat, (10, stats_y + i * 20)))
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.dirty + dirty)
+        self.dirty = dirty
+
+
+def write_json_atomic(path: str, payload):
+    with open(path + ".tmp", "w") as f:
+        json.dump(payload, f, indent=2, default=str)
+    os.replace(path + ".tmp", path)
+
+
+def write_exports(data_dir: str, exports: dict):
+    os.makedirs(data_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=len(exports)) as pool:
+        futures = [
+            pool.submit(write_json_atomic, os.path.join(data_dir, filename), payload)
+            for filename, payload in exports.items()
+        ]
+        for future in futures:
+            future.result()
+
+
+class SnapshotWriter:
+    # background thread that turns simulation snapshots into the export files; if saves arrive
+    # faster than they can be written, only the latest pending snapshot is kept
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.pending = None
+        self.closed = False
+        self.saves = 0
+        self.thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, snapshot: "TownSimulation"):
+        with self.condition:
+            self.pending = snapshot
+            self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                snapshot, self.pending = self.pending, None
+                if snapshot is None:
+                    return
+            try:
+                snapshot.write_simulation_data()
+                self.saves += 1
+            except Exception as e:
+                print(f"Background save failed: {e}")
+
+    def close(self):
+        # waits for the last submitted snapshot to be written
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.thread.join()
+
+
+class TownSimulation:
+    def __init__(self, headless: bool = False, data_dir: str = DATA_DIR, templates: PostTemplateCatalog = None,
+                 population: Population = None, organizations: List[Organization] = None,
+                 num_people: int = 300, num_organizations: int = 15, seed: int = None):
+        self.headless = headless
+        self.data_dir = data_dir
+        self.screen = None
+        self.clock = None
+        self.renderer = None
+        if not headless:
+            self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+            pygame.display.set_caption("Community Town Simulation")
+            self.clock = pygame.time.Clock()
+            self.renderer = TownRenderer(self.screen)
         self.running = True
         
-        self.num_people = 300
-        self.num_organizations = 15
-
-        self.people = []
-        self.organizations = []
-        self.posts = []
-        self.supply_demand_data = []
-        self.volunteer_matches = []
+        self.num_people = num_people
+        self.num_organizations = num_organizations
+        self.seed = seed
+        self.random = random.Random(seed)
+
+        self.rng = np.random.default_rng(seed)
+        self.people = population
+        self.organizations = organizations if organizations is not None else []
+        self.org_version = 0
+        self.activity = 1.0  # multiplier on the town-wide posting rate
+        self.sim_time = 0.0  # simulated seconds since start; posts are stamped epoch + sim_time
+        self.epoch = time.time()
+        self.events = EventQueue()
+        self.processes_started = False
+        self._post_cum_rate = None
+        self.posts = deque()
+        self.total_posts = 0
+        self.retention = RetentionPolicy()
+        self.archive = None
+        self.volunteer_matches = deque()  # in post id order; a request is matched once, when first seen
+        self.match_cursor = 0  # highest post id already considered for matching
+        self.volunteer_index = None
+        self._skill_mask_cache = {}
    
         self.post_id_counter = 1
+        self.post_id_stride = 1
         self.person_id_counter = 1
         self.org_id_counter = 1
         
         # categories posts
-        self.categories = [
-            "food", "clothing", "housing", "transportation", "childcare",
-            "medical", "education", "employment", "furniture", "technology",
-            "emergency", "mental_health", "elderly_care", "pet_care", "utilities"
-        ]
+        self.categories = CATEGORIES
         
         # skills for volunteers
         self.skills = [
@@ -127,635 +1395,453 @@ class TownSimulation:
             "clinic": ["medical", "mental_health", "emergency"]
         }
         
+        # running per-category counters, updated as posts are added
+        self.category_index = {category: i for i, category in enumerate(self.categories)}
+        self.category_offers = np.zeros(len(self.categories), dtype=np.int64)
+        self.category_requests = np.zeros(len(self.categories), dtype=np.int64)
+        self.category_locations = [deque(maxlen=LOCATION_CLUSTER_SIZE) for _ in self.categories]
+        self.series = CategoryTimeSeries(len(self.categories))
+        self.supply_demand_data = deque(maxlen=SUPPLY_DEMAND_HISTORY * len(self.categories))
+        self.supply_demand_seq = 0
+        self.checkpoint_writer = None
+        self.sqlite_sink = None
+        self.snapshot_writer = None
+
+        self.templates = (templates or PostTemplateCatalog.default()).compile(self.categories)
+
         self.initialize_simulation()
+
+    @classmethod
+    def from_scenario(cls, name: str, seed: int = None, **kwargs) -> "TownSimulation":
+        scenario = SCENARIOS[name]
+        simulation = cls(
+            num_people=scenario["num_people"],
+            num_organizations=scenario["num_organizations"],
+            seed=scenario["seed"] if seed is None else seed,
+            **kwargs
+        )
+        simulation.activity = scenario["activity"]
+        return simulation
         
     def initialize_simulation(self):
+        if self.people is not None:
+            self.num_people = len(self.people)
+            self.num_organizations = len(self.organizations)
+            return
+
         org_types = ["food_bank", "shelter", "school", "clinic"]
         for i in range(self.num_organizations):  
-            org_type = random.choice(org_types)
+            org_type = self.random.choice(org_types)
             org = Organization(
                 id=self.org_id_counter,
                 name=f"{org_type.replace('_', ' ').title()} {i+1}",
                 org_type=org_type,
-                x=random.uniform(50, WINDOW_WIDTH-50),
-                y=random.uniform(50, WINDOW_HEIGHT-50),
-                capacity=random.randint(20, 200),
-                current_usage=random.randint(5, 150),
-                operating_hours=f"{random.randint(6,9)}AM-{random.randint(4,8)}PM",
-                current_shortages=random.sample(self.categories, random.randint(1,4)),
+                x=self.random.uniform(50, WINDOW_WIDTH-50),
+                y=self.random.uniform(50, WINDOW_HEIGHT-50),
+                capacity=self.random.randint(20, 200),
+                current_usage=self.random.randint(5, 150),
+                operating_hours=f"{self.random.randint(6,9)}AM-{self.random.randint(4,8)}PM",
+                current_shortages=self.random.sample(self.categories, self.random.randint(1,4)),
                 services=self.org_services[org_type]
             )
             self.organizations.append(org)
             self.org_id_counter += 1
             
-        for i in range(self.num_people): 
-            person_type = random.choices(list(PersonType), weights=[100, 35, 5, 15] )[0] #num of people there
-            
-            person = Person(
-                id=self.person_id_counter,
-                name=f"Person_{i+1}",
-                person_type=person_type,
-                x=random.uniform(50, WINDOW_WIDTH-50),
-                y=random.uniform(50, WINDOW_HEIGHT-50),
-                skills=random.sample(self.skills, random.randint(1, 4)) if person_type in [PersonType.VOLUNTEER, PersonType.PROVIDER] else [],
-                needs=random.sample(self.categories, random.randint(0, 3)),
-                reputation=random.uniform(0.1, 1.0),
-                posts_created=0,
-                safety_score=random.uniform(0.5, 1.0)
-            )
-            self.people.append(person)
-            self.person_id_counter += 1
+        self.people = Population.generate(self.num_people, self.skills, self.categories, self.rng)
+        self.person_id_counter += self.num_people
     
-    def generate_suspicious_content(self, description: str) -> List[str]:
-        flags = []
-        suspicious_patterns = [
-            ("scam", ["money", "cash", "wire", "urgent payment"]),
-            ("inappropriate", ["personal info", "meet alone", "private"]),
-            ("spam", ["click here", "amazing deal", "limited time"])
-        ]
-        
-        for flag_type, keywords in suspicious_patterns:
-            if any(keyword in description.lower() for keyword in keywords):
-                flags.append(flag_type)
-                
-        if random.random() < 0.05:  # 5% chance of being flagged as duplicate
-            flags.append("duplicate")
-            
-        return flags
-    
-    def generate_post(self, person: Person) -> Post:
-        post_type = "offer" if person.person_type in [PersonType.PROVIDER, PersonType.VOLUNTEER] else random.choice(["offer", "request"])
-        category = random.choice(self.categories)
-        
-        if post_type == "offer":
-            titles = {
-                "food": [
-                    "Free groceries available", "Home-cooked meals ready", "Fresh vegetables from garden",
-                    "Leftover catering food", "Baby formula available", "Free bread from bakery",
-                    "Community soup kitchen", "Fresh fruit pickup", "Pantry cleanout items",
-                    "Restaurant surplus food", "Holiday meal preparation", "Bulk rice and beans",
-                    "Free lunch for kids", "Farmers market extras", "Meal prep containers",
-                    "Homemade preserves", "Free coffee and pastries", "Community potluck leftovers"
-                ],
-                "clothing": [
-                    "Winter coats for kids", "Professional attire donation", "Gently used shoes",
-                    "Back to school clothes", "Baby clothes 0-2T", "Plus size women's clothing",
-                    "Men's work boots size 10-12", "Formal wear for interviews", "Maternity clothes",
-                    "Halloween costumes", "Sports uniforms", "Rain gear available",
-                    "Designer clothes donation", "Warm blankets and linens", "Undergarments new with tags",
-                    "School uniforms", "Vintage clothing lot", "Athletic wear and sneakers"
-                ],
-                "transportation": [
-                    "Rides to appointments", "Moving help with truck", "Airport pickup service",
-                    "Daily commute carpool", "Grocery store runs", "School pickup/dropoff",
-                    "Medical transport", "Job interview rides", "Bus pass donations",
-                    "Car repair help", "Jump start service", "Furniture delivery",
-                    "Senior citizen rides", "Emergency transportation", "Weekend taxi service",
-                    "Bike repair and tune-up", "Moving boxes and supplies", "Gas money assistance"
-                ],
-                "childcare": [
-                    "Babysitting services", "After school care", "Weekend childcare",
-                    "Date night babysitting", "Emergency childcare", "Summer camp alternative",
-                    "Tutoring and homework help", "Newborn care assistance", "Special needs support",
-                    "Playdates and activities", "School holiday coverage", "Evening childcare",
-                    "Birthday party supervision", "Sick child care", "Single parent support",
-                    "Toddler activities", "Teen mentorship", "Art and craft sessions"
-                ],
-                "medical": [
-                    "Free health screenings", "Prescription delivery", "Medical equipment loan",
-                    "First aid training", "Blood pressure checks", "Mental health counseling",
-                    "Dental cleaning vouchers", "Eye exam assistance", "Physical therapy help",
-                    "Medical appointment rides", "Health insurance navigation", "Medication management",
-                    "Wellness workshops", "Vaccine clinic", "Senior health checks",
-                    "Nutrition counseling", "Support group meetings", "Medical bill assistance"
-                ],
-                "education": [
-                    "Math tutoring available", "English lessons", "Computer skills help",
-                    "SAT prep sessions", "Adult literacy classes", "Job skills training",
-                    "Resume writing help", "College application aid", "Language exchange",
-                    "Art lessons for kids", "Music instrument lessons", "Science fair help",
-                    "Homework club", "Study group formation", "Public speaking practice",
-                    "Financial literacy class", "Digital literacy training", "Career counseling"
-                ],
-                "employment": [
-                    "Job referral network", "Interview practice", "Professional networking",
-                    "Skills training workshop", "Resume review service", "LinkedIn profile help",
-                    "Career change guidance", "Freelance opportunities", "Part-time positions",
-                    "Work from home jobs", "Apprenticeship programs", "Job fair information",
-                    "Professional references", "Industry connections", "Salary negotiation tips",
-                    "Portfolio development", "Business startup help", "Professional mentorship"
-                ],
-                "furniture": [
-                    "Moving sale everything", "Free dining table", "Kids bedroom set",
-                    "Office furniture donation", "Couch and chairs", "Kitchen appliances",
-                    "Mattress and box spring", "Bookshelves and storage", "Patio furniture set",
-                    "Baby furniture and gear", "Electronics and TV", "Home decor items",
-                    "Exercise equipment", "Garden furniture", "Craft supplies lot",
-                    "Holiday decorations", "Board games and toys", "Household essentials"
-                ],
-                "technology": [
-                    "Free laptop repair", "Phone setup help", "WiFi troubleshooting",
-                    "Computer donations", "Tech support for seniors", "Software installation",
-                    "Online safety training", "Digital device lessons", "Internet access sharing",
-                    "Smartphone tutorials", "Social media setup", "Online banking help",
-                    "Video call assistance", "Email account creation", "Password management",
-                    "Device data transfer", "App recommendations", "Digital photo organizing"
-                ],
-                "emergency": [
-                    "Emergency shelter space", "Crisis support available", "Food bank emergency",
-                    "Utility bill assistance", "Rent payment help", "Emergency childcare",
-                    "Medical emergency aid", "Transportation to hospital", "Temporary housing",
-                    "Storm damage cleanup", "Emergency supplies kit", "Pet emergency care",
-                    "Legal emergency help", "Family crisis support", "Disaster relief aid",
-                    "Safety planning help", "Emergency contact service", "Crisis intervention"
-                ],
-                "mental_health": [
-                    "Peer support meetings", "Anxiety management group", "Grief counseling",
-                    "Stress relief workshop", "Meditation sessions", "Support group hosting",
-                    "Crisis intervention training", "Wellness check-ins", "Mindfulness practice",
-                    "Art therapy sessions", "Music therapy group", "Recovery support",
-                    "Teen counseling", "Family therapy", "Trauma support group",
-                    "Suicide prevention training", "Mental health first aid", "Self-care workshops"
-                ],
-                "elderly_care": [
-                    "Senior companion visits", "Grocery shopping help", "Technology assistance",
-                    "Light housekeeping", "Medication reminders", "Doctor appointment rides",
-                    "Social activities planning", "Meal preparation", "Pet care for seniors",
-                    "Home safety checks", "Bill paying assistance", "Library book delivery",
-                    "Garden maintenance", "Letter writing help", "Phone call check-ins",
-                    "Exercise programs", "Memory care activities", "Holiday celebration help"
-                ],
-                "pet_care": [
-                    "Dog walking service", "Pet sitting available", "Free pet supplies",
-                    "Veterinary care vouchers", "Pet grooming help", "Emergency pet care",
-                    "Pet training classes", "Animal foster care", "Pet food donations",
-                    "Spay/neuter assistance", "Pet adoption events", "Lost pet search help",
-                    "Senior pet care", "Special needs pets", "Pet therapy visits",
-                    "Animal rescue transport", "Pet photography", "Pet memorial services"
-                ],
-                "utilities": [
-                    "Utility bill assistance", "Energy audit help", "Weatherization supplies",
-                    "Generator sharing", "Internet access sharing", "Phone service help",
-                    "Heating bill relief", "Solar panel information", "Energy saving tips",
-                    "Appliance repair", "HVAC maintenance", "Plumbing assistance",
-                    "Electrical work help", "Home insulation", "Water conservation tips",
-                    "Emergency power backup", "Utility payment plans", "Energy assistance programs"
-                ],
-                "housing": [
-                    "Temporary housing", "Room rental offer", "House-sitting available",
-                    "Moving assistance", "Home repairs help", "Painting services",
-                    "Cleaning services", "Landscaping help", "Security deposit loan",
-                    "Roommate matching", "Housing search help", "Lease negotiation",
-                    "Home maintenance", "Pest control assistance", "Storage space offer",
-                    "Garage cleanout help", "Home organizing", "Furniture assembly"
-                ]
-            }
-        else:  # requests
-            titles = {
-                "food": [
-                    "Need groceries urgently", "Looking for baby formula", "Food for family of 5",
-                    "Emergency food assistance", "School lunch money needed", "Food allergies - need help",
-                    "Diabetic meals needed", "Fresh produce wanted", "Thanksgiving meal help",
-                    "Baby food and supplies", "Gluten-free options needed", "Halal food sources",
-                    "Food stamps application", "Community garden space", "Cooking lessons needed",
-                    "Kitchen equipment loan", "Meal delivery help", "Food bank referral"
-                ],
-                "housing": [
-                    "Need temporary shelter", "Looking for apartment", "Housing assistance needed",
-                    "Eviction prevention help", "Security deposit loan", "Room rental search",
-                    "Homeless shelter info", "Moving help needed", "Storage unit rental",
-                    "Roommate wanted", "Pet-friendly housing", "Accessible housing search",
-                    "Rent payment assistance", "Housing voucher help", "Landlord references",
-                    "Lease cosigner needed", "Home repairs urgent", "Utility setup help"
-                ],
-                "medical": [
-                    "Need doctor appointment", "Prescription help needed", "Medical transportation",
-                    "Health insurance enrollment", "Dental care urgent", "Vision care needed",
-                    "Mental health counseling", "Physical therapy access", "Medical equipment needed",
-                    "Hospital bill assistance", "Specialist referral needed", "Medical records help",
-                    "Wheelchair rental", "Home health aide", "Medication management",
-                    "Blood test assistance", "Surgery support needed", "Recovery care help"
-                ],
-                "employment": [
-                    "Job search help needed", "Resume assistance urgent", "Interview preparation",
-                    "Work clothes needed", "Transportation to work", "Childcare for work",
-                    "Job training programs", "Career counseling", "Professional references",
-                    "Skills certification help", "Job placement assistance", "Workplace accommodation",
-                    "Part-time opportunities", "Remote work setup", "Professional networking",
-                    "Business license help", "Freelance guidance", "Unemployment assistance"
-                ],
-                "transportation": [
-                    "Need ride to work daily", "Car repair assistance", "Bus pass needed",
-                    "Medical appointment ride", "Moving truck rental", "Airport ride needed",
-                    "Kids school transport", "Grocery shopping rides", "Job interview transport",
-                    "Car insurance help", "Driver's license renewal", "Vehicle registration help",
-                    "Gas money assistance", "Parking permit help", "Public transit info",
-                    "Bicycle repair needed", "Car seat installation", "Emergency towing"
-                ],
-                "childcare": [
-                    "Babysitter needed ASAP", "After school care", "Weekend childcare help",
-                    "Special needs childcare", "Newborn help needed", "Summer camp scholarship",
-                    "Tutoring for child", "Daycare scholarship", "Emergency babysitting",
-                    "Playdate coordination", "Child transportation", "Birthday party help",
-                    "Homework assistance", "Bedtime routine help", "Sick child care",
-                    "School pickup help", "Teen supervision", "Child activity transport"
-                ],
-                "clothing": [
-                    "Winter coats for kids", "Professional attire needed", "School uniforms",
-                    "Maternity clothes size L", "Work boots size 11", "Formal dress rental",
-                    "Baby clothes 6-12 months", "Plus size clothing", "Rain gear needed",
-                    "Athletic wear for teens", "Graduation outfit", "Interview clothes",
-                    "Halloween costume help", "Warm blankets needed", "Undergarments needed",
-                    "Shoes for growing kids", "Costume for play", "Uniform alterations"
-                ],
-                "furniture": [
-                    "Bed and mattress needed", "Kitchen table wanted", "Kids furniture needed",
-                    "Moving boxes required", "Refrigerator needed", "Washing machine help",
-                    "Couch and chairs", "Office desk needed", "Storage solutions",
-                    "Baby crib and supplies", "Wheelchair accessible", "Dining room set",
-                    "Bedroom furniture", "Kitchen appliances", "Entertainment center",
-                    "Patio furniture", "Exercise equipment", "Home office setup"
-                ],
-                "technology": [
-                    "Computer for school", "Internet access needed", "Phone repair help",
-                    "Laptop for job search", "WiFi setup assistance", "Tech support needed",
-                    "Online learning tools", "Digital literacy help", "Smartphone needed",
-                    "Printer for documents", "Software assistance", "Data recovery help",
-                    "Video conferencing setup", "Email account help", "Social media guidance",
-                    "Online banking setup", "Digital photo help", "App installation"
-                ],
-                "emergency": [
-                    "Immediate shelter needed", "Emergency food now", "Crisis intervention",
-                    "Utility shutoff help", "Rent due tomorrow", "Medical emergency",
-                    "Domestic violence help", "Homeless tonight", "Emergency childcare",
-                    "Pet emergency care", "Transportation crisis", "Legal emergency",
-                    "Mental health crisis", "Family emergency", "Natural disaster aid",
-                    "Safety planning help", "Emergency supplies", "Immediate cash help"
-                ],
-                "mental_health": [
-                    "Counseling services needed", "Support group access", "Crisis intervention",
-                    "Anxiety help urgent", "Depression support", "Trauma counseling",
-                    "Addiction recovery", "Family therapy needed", "Teen counseling",
-                    "Grief support group", "Stress management", "Anger management",
-                    "Eating disorder help", "PTSD treatment", "Bipolar support",
-                    "Suicide prevention help", "Self-harm support", "Mental health advocate"
-                ],
-                "elderly_care": [
-                    "Senior care needed", "Companion for elderly", "Medical rides for senior",
-                    "Grocery shopping help", "Medication management", "Home safety check",
-                    "Social visits needed", "Technology help for senior", "Meal preparation",
-                    "Light housekeeping", "Pet care for elderly", "Bill paying help",
-                    "Garden maintenance", "Transportation to activities", "Health monitoring",
-                    "Emergency contact needed", "Memory care support", "Exercise companion"
-                ],
-                "pet_care": [
-                    "Dog walker needed", "Pet sitting urgent", "Veterinary care help",
-                    "Pet food assistance", "Emergency pet care", "Pet grooming help",
-                    "Animal foster needed", "Lost pet search", "Pet supplies needed",
-                    "Spay/neuter assistance", "Pet training help", "Senior pet care",
-                    "Special needs pet", "Pet medication help", "Animal transport",
-                    "Pet boarding needed", "Vet bill assistance", "Pet behavioral help"
-                ],
-                "utilities": [
-                    "Electric bill help", "Heat shutoff notice", "Internet service needed",
-                    "Phone service help", "Water bill assistance", "Gas bill overdue",
-                    "Energy assistance needed", "Utility deposit help", "Service restoration",
-                    "Weatherization help", "Appliance repair", "HVAC assistance",
-                    "Plumbing emergency", "Electrical work needed", "Home insulation",
-                    "Energy audit needed", "Solar information", "Generator rental"
-                ],
-                "education": [
-                    "Tutoring needed", "School supplies help", "College application aid",
-                    "Adult education classes", "GED preparation", "Language learning",
-                    "Computer literacy", "Job skills training", "Scholarship information",
-                    "School lunch assistance", "Transportation to school", "Homework help",
-                    "Study group needed", "Test preparation", "Career counseling",
-                    "Library card help", "Educational supplies", "Learning disability support"
-                ]
-            }
-
-        
-        title = random.choice(titles.get(category, [f"{post_type.title()} for {category}"]))
-        
-        # potential safety issues
-        base_descriptions = {
-            "offer": [
-                f"Available to help with {category} in our community",
-                f"Happy to provide {category} support to neighbors in need",
-                f"Offering {category} assistance - please reach out",
-                f"Community member willing to help with {category}",
-                f"Local {category} support available",
-                f"Sharing resources for {category} needs",
-                f"Volunteer help available for {category}",
-                f"No cost {category} assistance offered"
-            ],
-            "request": [
-                f"Seeking help with {category} situation",
-                f"Family needs assistance with {category}",
-                f"Looking for {category} support in our area",
-                f"Could use community help with {category}",
-                f"Requesting {category} assistance",
-                f"In need of {category} help",
-                f"Struggling with {category} - need support",
-                f"Emergency {category} assistance needed"
-            ]
-        }
-        
-        post_type = random.choice(["offer", "request"])
-        description = random.choice(base_descriptions[post_type])
+    def sample_posters(self, n: int) -> np.ndarray:
+        # picking the poster in proportion to their rate makes the town-wide stream the superposition
+        # of independent per-person Poisson processes
+        cum_rate = self._post_cum_rate
+        if cum_rate is None or len(cum_rate) != self.num_people:
+            cum_rate = self._post_cum_rate = np.cumsum(self.people.post_rate[:self.num_people], dtype=np.float64)
+        if not len(cum_rate) or cum_rate[-1] <= 0:
+            return self.rng.integers(0, self.num_people, size=n)
+        return np.searchsorted(cum_rate, self.rng.random(n) * cum_rate[-1], side="right")
 
-        
+    def generate_posts(self, n: int, created_at: List[float] = None) -> List[Post]:
+        # batch version of generate_post: every random draw is one vectorized numpy call
+        people = self.people
+        catalog = self.templates
+        rng = self.rng
+        if n <= 0:
+            return []
 
-        if random.random() < 0.1:  # 10% chance
-            suspicious_additions = [
-                " Send cash payment upfront! No questions asked!",
-                " Meet me alone in parking lot after dark",
-                " Click this suspicious link for amazing deals!!!",
-                " Wire money immediately or offer expires",
-                " Must have your social security number first",
-                " Bring all your personal documents to meet",
-                " Only contact through encrypted messaging app",
-                " No phone calls, cash only transactions",
-                " Delete this message after reading",
-                " Urgent - government assistance available (fake)",
-                " Collect personal information for verification",
-                " Request bank account details for payment"
-            ]
-            description += random.choice(suspicious_additions)
-        
-        urgency_weights = {
-            "emergency": [0.7, 0.2, 0.1],
-            "medical": [0.5, 0.3, 0.2], 
-            "food": [0.3, 0.4, 0.3],
-            "housing": [0.4, 0.4, 0.2]
-        }
-        weights = urgency_weights.get(category, [0.2, 0.3, 0.5])
-        urgency = random.choices(list(UrgencyLevel), weights=weights)[0].value
-        
-        is_duplicate = random.random() < 0.08  # 8% chance of duplicate
-        
-        post = Post(
-            id=self.post_id_counter,
-            user_id=person.id,
-            post_type=post_type,
-            category=category,
-            title=title,
-            description=description,
-            urgency=urgency,
-            location=(person.x, person.y),
-            timestamp=datetime.now().isoformat(),
-            safety_flags=self.generate_suspicious_content(description),
-            is_duplicate=is_duplicate,
-            user_reputation=person.reputation
+        idx = self.sample_posters(n)
+        title_kind = np.where(np.isin(people.person_type[idx], SKILLED_PERSON_TYPES), 0, rng.integers(0, 2, size=n))
+        c = rng.integers(0, len(self.categories), size=n)
+        title = (rng.random(n) * catalog.title_counts[title_kind, c]).astype(np.int64)
+        t = rng.integers(0, 2, size=n)
+        d = (rng.random(n) * catalog.description_counts[t, c]).astype(np.int64)
+        s = np.where(
+            rng.random(n) < SUSPICIOUS_RATE,
+            1 + rng.integers(0, len(catalog.suspicious_additions), size=n),
+            0
         )
-        
-        self.post_id_counter += 1
-        person.posts_created += 1
-        
-        return post
+        urgency = (rng.random(n)[:, None] > catalog.urgency_cum_weights_array[c]).sum(axis=1)
+        urgency = np.minimum(urgency, len(URGENCY_VALUES) - 1)
+        is_duplicate = rng.random(n) < DUPLICATE_RATE
+        duplicate_flag = rng.random(n) < DUPLICATE_FLAG_RATE
+
+        np.add.at(people.posts_created, idx, 1)
+        if created_at is None:
+            created_at = itertools.repeat(self.now(), n)
+        first_id = self.post_id_counter
+        stride = self.post_id_stride
+        self.post_id_counter += n * stride
+
+        titles = catalog.titles
+        full_descriptions = catalog.full_descriptions
+        description_flags = catalog.description_flags
+        posts = []
+        for i, (user_id, x, y, reputation, kind, ci, title_i, type_i, di, si, ui, dup, dflag, post_time) in enumerate(zip(
+            people.id[idx].tolist(), people.x[idx].tolist(), people.y[idx].tolist(), people.reputation[idx].tolist(),
+            title_kind.tolist(), c.tolist(), title.tolist(), t.tolist(), d.tolist(),
+            s.tolist(), urgency.tolist(), is_duplicate.tolist(), duplicate_flag.tolist(), created_at
+        )):
+            flags = description_flags[type_i][ci][di][si]
+            if dflag:
+                flags |= DUPLICATE_FLAG
+            posts.append(Post(
+                id=first_id + i * stride,
+                user_id=user_id,
+                type_code=type_i,
+                category_code=ci,
+                title=titles[kind][ci][title_i],
+                description=full_descriptions[type_i][ci][di][si],
+                urgency_code=ui,
+                x=x,
+                y=y,
+                created_at=post_time,
+                flags=flags,
+                is_duplicate=dup,
+                user_reputation=reputation
+            ))
+        return posts
     
+    def add_posts(self, posts: List[Post]):
+        # posts must arrive in time order; the time series takes the whole batch in one update
+        for post in posts:
+            self.posts.append(post)
+            self.total_posts += 1
+
+            i = post.category_code
+            if post.type_code == OFFER:
+                self.category_offers[i] += 1
+            elif post.type_code == REQUEST:
+                self.category_requests[i] += 1
+            self.category_locations[i].append((post.x, post.y))
+            if self.sqlite_sink is not None:
+                self.sqlite_sink.add(post)
+        if posts:
+            n = len(posts)
+            self.series.add_many(
+                np.fromiter((post.created_at for post in posts), dtype=np.float64, count=n) - self.epoch,
+                np.fromiter((post.type_code for post in posts), dtype=np.int64, count=n),
+                np.fromiter((post.category_code for post in posts), dtype=np.int64, count=n)
+            )
+
+    def apply_retention(self):
+        # counters are cumulative, so evicting posts leaves supply/demand numbers untouched
+        policy = self.retention
+        posts = self.posts
+        evict = 0
+        if policy.max_posts is not None and len(posts) > policy.max_posts:
+            evict = len(posts) - policy.max_posts
+        if policy.max_age_seconds is not None:
+            cutoff = self.now() - policy.max_age_seconds
+            while evict < len(posts) and posts[evict].created_at < cutoff:
+                evict += 1
+        if not evict:
+            return
+
+        if posts[evict - 1].id > self.match_cursor:
+            self.generate_volunteer_matches()  # requests are matched before they leave memory
+        evicted = [posts.popleft() for _ in range(evict)]
+        matches = self.volunteer_matches
+        evicted_matches = []
+        while matches and matches[0]["post_id"] <= evicted[-1].id:
+            evicted_matches.append(matches.popleft())
+        if self.checkpoint_writer is not None:
+            self.checkpoint_writer.append_posts(evicted)
+            self.checkpoint_writer.append_matches(evicted_matches)
+        if self.sqlite_sink is not None:
+            self.sqlite_sink.add_matches(evicted_matches)
+        if self.archive is None:
+            self.archive = PostArchive(os.path.join(self.data_dir, ARCHIVE_DIR))
+        self.archive.add(evicted)
+
     def generate_supply_demand_data(self):
-        for category in self.categories:
-            offers = sum(1 for post in self.posts if post.category == category and post.post_type == "offer")
-            requests = sum(1 for post in self.posts if post.category == category and post.post_type == "request")
+        # offers/requests stay all-time totals; the shortage level comes from the recent window
+        timestamp = datetime.fromtimestamp(self.now()).isoformat()
+        offers_by_category = self.category_offers.tolist()
+        requests_by_category = self.category_requests.tolist()
+        window = self.series.window(SHORTAGE_WINDOW_SECONDS)
+        window_seconds = min(SHORTAGE_WINDOW_SECONDS, max(self.series.time, SIM_TICK_SECONDS))
+        window_offers = window[OFFER].tolist()
+        window_requests = window[REQUEST].tolist()
+        for i, category in enumerate(self.categories):
+            offers = window_offers[i]
+            requests = window_requests[i]
             
             shortage_level = max(0, (requests - offers) / max(requests, 1))
             
-            category_posts = [post for post in self.posts if post.category == category]
-            location_clusters = [(post.location[0], post.location[1]) for post in category_posts[:5]]
+            location_clusters = list(self.category_locations[i])
             
             supply_demand = SupplyDemandData(
                 category=category,
-                offers=offers,
-                requests=requests,
+                offers=offers_by_category[i],
+                requests=requests_by_category[i],
                 shortage_level=shortage_level,
-                timestamp=datetime.now().isoformat(),
-                location_clusters=location_clusters
+                timestamp=timestamp,
+                location_clusters=location_clusters,
+                window_seconds=window_seconds,
+                window_offers=offers,
+                window_requests=requests,
+                offers_per_hour=offers * 3600 / window_seconds,
+                requests_per_hour=requests * 3600 / window_seconds
             )
             
             self.supply_demand_data.append(supply_demand)
+        self.supply_demand_seq += 1
+
+    def time_series_export(self) -> dict:
+        export = {}
+        for level, (width, _) in enumerate(self.series.resolutions):
+            starts, counts = self.series.buckets(level)
+            export[SERIES_LABELS.get(width, f"{width}s")] = {
+                "bucket_seconds": width,
+                "bucket_starts": [datetime.fromtimestamp(self.epoch + start).isoformat() for start in starts.tolist()],
+                "offers": {category: counts[:, OFFER, i].tolist() for i, category in enumerate(self.categories)},
+                "requests": {category: counts[:, REQUEST, i].tolist() for i, category in enumerate(self.categories)}
+            }
+        return export
+
+    def shutdown(self):
+        # runs whether or not a final save happened: buffered archive posts and SQLite rows are
+        # only written on flush, and posts since the last checkpoint only by one more checkpoint
+        if self.checkpoint_writer is not None:
+            self.generate_volunteer_matches()
+            self.checkpoint_writer.write(self)
+        if self.archive is not None:
+            self.archive.flush()
+        if self.sqlite_sink is not None:
+            self.sqlite_sink.close()
+
+    def enable_checkpoints(self):
+        # called before the run starts, so posts evicted ahead of the first checkpoint still reach the stream
+        if self.checkpoint_writer is None:
+            self.checkpoint_writer = CheckpointWriter(os.path.join(self.data_dir, CHECKPOINT_DIR))
+
+    def checkpoint(self):
+        self.enable_checkpoints()
+        self.checkpoint_writer.write(self)
+        if self.archive is not None:
+            self.archive.flush()
+        if self.sqlite_sink is not None:
+            self.sqlite_sink.write(self)
     
+    def skills_needed_mask(self, description: str, category: str) -> int:
+        key = (description, category)
+        mask = self._skill_mask_cache.get(key)
+        if mask is None:
+            description = description.lower()
+            category = category.lower()
+            mask = 0
+            for bit, skill in enumerate(self.skills):
+                if skill in description or skill in category:
+                    mask |= 1 << bit
+            self._skill_mask_cache[key] = mask
+        return mask
+
+    def build_volunteer_index(self) -> VolunteerIndex:
+        volunteer_idx = self.people.indices_of_type(PersonType.VOLUNTEER)
+        volunteer_idx = volunteer_idx[self.people.skill_mask[volunteer_idx] != 0]
+        return VolunteerIndex(self.people, volunteer_idx)
+
     def generate_volunteer_matches(self):
-        volunteers = [p for p in self.people if p.person_type == PersonType.VOLUNTEER and p.skills]
-        request_posts = [p for p in self.posts if p.post_type == "request"]
+        if self.volunteer_index is None:
+            self.volunteer_index = self.build_volunteer_index()
+        people = self.people
+
+        # volunteers never move, so a request that found no match will not find one later either;
+        # only posts that arrived since the last call are looked at and earlier matches carry forward
+        new_posts = []
+        for post in reversed(self.posts):
+            if post.id <= self.match_cursor:
+                break
+            new_posts.append(post)
+        if not new_posts:
+            return
+        self.match_cursor = new_posts[0].id
         
-        matches = []
-        for post in request_posts[:50]:
-            poster = next((p for p in self.people if p.id == post.user_id), None)
-            if not poster:
+        matches = self.volunteer_matches
+        timestamp = datetime.now().isoformat()
+        for post in reversed(new_posts):
+            if post.type_code != REQUEST:
+                continue
+            needed = self.skills_needed_mask(post.description, post.category)
+            if not needed or people.index_of(post.user_id) < 0:
                 continue
                 
-            relevant_volunteers = []
-            for volunteer in volunteers:
-                skill_match = any(skill in post.description.lower() or skill in post.category.lower() for skill in volunteer.skills)
-                if skill_match:
-                    distance = math.sqrt((volunteer.x - post.location[0])**2 + (volunteer.y - post.location[1])**2)
-                    relevant_volunteers.append({
-                        "volunteer_id": volunteer.id,
-                        "volunteer_name": volunteer.name,
-                        "skills": volunteer.skills,
+            nearest = self.volunteer_index.nearest(post.x, post.y, needed)
+            if nearest:
+                relevant_volunteers = [
+                    {
+                        "volunteer_id": int(people.id[idx]),
+                        "volunteer_name": f"Person_{int(people.id[idx])}",
+                        "skills": mask_to_names(int(people.skill_mask[idx]), self.skills),
                         "distance": distance,
-                        "reputation": volunteer.reputation
-                    })
-            
-            if relevant_volunteers:
-                relevant_volunteers.sort(key=lambda x: (x["distance"], -x["reputation"]))
+                        "reputation": -neg_reputation
+                    }
+                    for distance, neg_reputation, idx in nearest
+                ]
                 
                 match = {
                     "post_id": post.id,
                     "seeker_id": post.user_id,
                     "category": post.category,
                     "urgency": post.urgency,
-                    "matched_volunteers": relevant_volunteers[:3], 
-                    "match_score": random.uniform(0.6, 1.0),
-                    "timestamp": datetime.now().isoformat()
+                    "matched_volunteers": relevant_volunteers, 
+                    "match_score": self.random.uniform(0.6, 1.0),
+                    "timestamp": timestamp
                 }
                 matches.append(match)
+    
+    def update_organization(self, org: Organization):
+        self.org_version += 1
+        org.current_usage += self.random.randint(-5, 8)
+        org.current_usage = max(0, min(org.current_usage, org.capacity))
         
-        self.volunteer_matches = matches
+        if self.random.random() < 0.3:  # 30% chance to change shortages
+            if org.current_shortages and self.random.random() < 0.5:
+                org.current_shortages.remove(self.random.choice(org.current_shortages))
+            else:
+                new_shortage = self.random.choice(self.categories)
+                if new_shortage not in org.current_shortages:
+                    org.current_shortages.append(new_shortage)
     
-    def update_organizations(self):
-        for org in self.organizations:
+    def render_snapshot(self) -> RenderSnapshot:
+        return RenderSnapshot(
+            people=self.people,
+            org_version=self.org_version,
+            organizations=[(org.org_type, org.x, org.y, org.current_usage, org.capacity) for org in self.organizations],
+            recent_posts=[
+                (post.x, post.y, post.post_type, bool(post.flags))
+                for post in itertools.islice(reversed(self.posts), RECENT_POSTS_SHOWN)
+            ],
+            total_posts=self.total_posts,
+            total_matches=len(self.volunteer_matches)
+        )
 
-            org.current_usage += random.randint(-5, 8)
-            org.current_usage = max(0, min(org.current_usage, org.capacity))
-            
-            if random.random() < 0.3:  # 30% chance to change shortages
-                if org.current_shortages and random.random() < 0.5:
-                    org.current_shortages.remove(random.choice(org.current_shortages))
-                else:
-                    new_shortage = random.choice(self.categories)
-                    if new_shortage not in org.current_shortages:
-                        org.current_shortages.append(new_shortage)
-    
     def draw(self):
-        self.screen.fill(WHITE)
-        
-        for org in self.organizations:
-            color = {
-                "food_bank": GREEN,
-                "shelter": BLUE,
-                "school": YELLOW,
-                "clinic": RED
-            }.get(org.org_type, GRAY)
-            
-            pygame.draw.rect(self.screen, color, (org.x-10, org.y-10, 20, 20))
-            
-            capacity_ratio = org.current_usage / org.capacity
-            bar_width = 30
-            bar_height = 5
-            pygame.draw.rect(self.screen, BLACK, (org.x-15, org.y+15, bar_width, bar_height))
-            pygame.draw.rect(self.screen, RED if capacity_ratio > 0.8 else GREEN, 
-                           (org.x-15, org.y+15, bar_width * capacity_ratio, bar_height))
-        
-        for person in self.people:
-            color = {
-                PersonType.RESIDENT: BLACK,
-                PersonType.VOLUNTEER: GREEN,
-                PersonType.ORGANIZATION: BLUE,
-                PersonType.PROVIDER: PURPLE
-            }.get(person.person_type, GRAY)
-            
-            pygame.draw.circle(self.screen, color, (int(person.x), int(person.y)), 3)
-        
-
-        recent_posts = self.posts[-50:] if len(self.posts) > 50 else self.posts
-        for post in recent_posts:
-            color = RED if post.post_type == "request" else GREEN
-            if post.safety_flags:
-                color = ORANGE
-            pygame.draw.circle(self.screen, color, (int(post.location[0]), int(post.location[1])), 2)
-        
-        legend_y = 10
-        font = pygame.font.Font(None, 24)
-        
-        legend_items = [
-            ("Organizations:", BLACK),
-            ("Food Bank", GREEN),
-            ("Shelter", BLUE), 
-            ("School", YELLOW),
-            ("Clinic", RED),
-            ("People:", BLACK),
-            ("Resident", BLACK),
-            ("Volunteer", GREEN),
-            ("Provider", PURPLE),
-            ("Posts:", BLACK),
-            ("Request", RED),
-            ("Offer", GREEN),
-            ("Flagged", ORANGE)
-        ]
-        
-        x_offset = 10
-        for i, (text, color) in enumerate(legend_items):
-            if i > 0 and i % 7 == 0:
-                x_offset += 150
-                legend_y = 10
-                
-            text_surface = font.render(text, True, color)
-            self.screen.blit(text_surface, (x_offset, legend_y))
-            legend_y += 25
-        
-        stats_y = WINDOW_HEIGHT - 100
-        stats = [
-            f"People: {len(self.people)}",
-            f"Organizations: {len(self.organizations)}", 
-            f"Posts: {len(self.posts)}",
-            f"Matches: {len(self.volunteer_matches)}"
-        ]
-        
-        for i, stat in enumerate(stats):
-            text_surface = font.render(stat, True, BLACK)
-            self.screen.blit(text_surface, (10, stats_y + i * 20))
-        
-        pygame.display.flip()
+        self.renderer.draw(self.render_snapshot())
     
-    def save_simulation_data(self):
-        os.makedirs("data/sim_data/", exist_ok=True)
-        
+    def build_exports(self) -> dict:
+        # one pass over posts builds every per-agent view; lookups go through hash indexes
+        matched_post_ids = {match["post_id"] for match in self.volunteer_matches}
+
+        post_records = []
+        posts_for_classification = []
+        posts_for_safety_check = []
+        unmatched_requests = []
+        flagged_posts = 0
+
+        for post in self.posts:
+            record = post.to_dict()
+            safety_flags = record["safety_flags"]
+            post_records.append(record)
+
+            # 1. Urgency Classifier Agent Data (NOT USING ❌)
+            posts_for_classification.append({
+                "post_id": post.id,
+                "title": post.title,
+                "description": post.description,
+                "category": record["category"],
+                "actual_urgency": record["urgency"],  # For training/validation
+                "timestamp": record["timestamp"]
+            })
+
+            # 3. Safety & Trust Agent Data
+            if safety_flags:
+                flagged_posts += 1
+            posts_for_safety_check.append({
+                "post_id": post.id,
+                "content": post.description,
+                "user_id": post.user_id,
+                "user_reputation": post.user_reputation,
+                "detected_flags": list(safety_flags),
+                "is_duplicate": post.is_duplicate,
+                "risk_level": "HIGH" if len(safety_flags) > 1 else "MEDIUM" if safety_flags else "LOW"
+            })
+
+            # 5. Volunteer Match Agent Data
+            if post.type_code == REQUEST and post.id not in matched_post_ids:
+                unmatched_requests.append({
+                    "post_id": post.id,
+                    "category": record["category"],
+                    "urgency": record["urgency"],
+                    "location": {"x": post.x, "y": post.y},
+                    "skills_needed": mask_to_names(self.skills_needed_mask(post.description, ""), self.skills),
+                    "seeker_id": post.user_id
+                })
+
+        supply_demand_records = [asdict(sd) for sd in self.supply_demand_data]
+
         simulation_data = {
             "people": [asdict(person) for person in self.people],
             "organizations": [asdict(org) for org in self.organizations],
-            "posts": [asdict(post) for post in self.posts],
-            "supply_demand": [asdict(sd) for sd in self.supply_demand_data],
-            "volunteer_matches": self.volunteer_matches,
+            "posts": post_records,
+            "supply_demand": supply_demand_records,
+            "volunteer_matches": list(self.volunteer_matches),
             "simulation_metadata": {
                 "timestamp": datetime.now().isoformat(),
                 "total_people": len(self.people),
                 "total_organizations": len(self.organizations),
-                "total_posts": len(self.posts),
+                "total_posts": self.total_posts,
+                "retained_posts": len(self.posts),
+                "archived_posts": self.archive.archived if self.archive else 0,
                 "categories": self.categories,
                 "skills": self.skills
             }
         }
         
-        with open("data/sim_data/complete_simulation.json", "w") as f:
-            json.dump(simulation_data, f, indent=2, default=str)
-        
-        
-        # 1. Urgency Classifier Agent Data (NOT USING ❌)
-        urgency_data = { 
-            "posts_for_classification": [
-                {
-                    "post_id": post.id,
-                    "title": post.title,
-                    "description": post.description,
-                    "category": post.category,
-                    "actual_urgency": post.urgency,  # For training/validation
-                    "timestamp": post.timestamp
-                }
-                for post in self.posts
-            ]
-        }
-        
-        with open("data/sim_data/urgency_classifier_data.json", "w") as f:
-            json.dump(urgency_data, f, indent=2)
-        
         # 2. Supply-Demand Balancer Agent Data  
         supply_demand_export = {
-            "supply_demand_analysis": [asdict(sd) for sd in self.supply_demand_data],
+            "supply_demand_analysis": supply_demand_records,
             "shortage_alerts": [
                 {
                     "category": sd.category,
                     "shortage_level": sd.shortage_level,
-                    "requests": sd.requests,
-                    "offers": sd.offers,
+                    "requests": sd.window_requests,
+                    "offers": sd.window_offers,
+                    "requests_per_hour": sd.requests_per_hour,
+                    "offers_per_hour": sd.offers_per_hour,
+                    "window_seconds": sd.window_seconds,
                     "alert_level": "HIGH" if sd.shortage_level > 0.7 else "MEDIUM" if sd.shortage_level > 0.4 else "LOW"
                 }
                 for sd in self.supply_demand_data if sd.shortage_level > 0.3
-            ]
+            ],
+            "time_series": self.time_series_export()
         }
         
-        with open("data/sim_data/supply_demand_data.json", "w") as f:
-            json.dump(supply_demand_export, f, indent=2)
-        
-        # 3. Safety & Trust Agent Data
         safety_data = {
-            "posts_for_safety_check": [
-                {
-                    "post_id": post.id,
-                    "content": post.description,
-                    "user_id": post.user_id,
-                    "user_reputation": post.user_reputation,
-                    "detected_flags": post.safety_flags,
-                    "is_duplicate": post.is_duplicate,
-                    "risk_level": "HIGH" if len(post.safety_flags) > 1 else "MEDIUM" if post.safety_flags else "LOW"
-                }
-                for post in self.posts
-            ],
+            "posts_for_safety_check": posts_for_safety_check,
             "user_safety_scores": [
                 {
-                    "user_id": person.id,
-                    "reputation": person.reputation,
-                    "safety_score": person.safety_score,
-                    "posts_created": person.posts_created
+                    "user_id": user_id,
+                    "reputation": reputation,
+                    "safety_score": safety_score,
+                    "posts_created": posts_created
                 }
-                for person in self.people
+                for user_id, reputation, safety_score, posts_created in zip(
+                    self.people.id.tolist(), self.people.reputation.tolist(),
+                    self.people.safety_score.tolist(), self.people.posts_created.tolist()
+                )
             ]
         }
         
-        with open("data/sim_data/safety_trust_data.json", "w") as f:
-            json.dump(safety_data, f, indent=2)
-        
         # 4. Org Sync Agent Data
         org_sync_data = {
             "organizations": [
@@ -784,7 +1870,7 @@ class TownSimulation:
                         {
                             "category": shortage,
                             "urgency": "Immediate" if org.current_usage > org.capacity * 0.8 else "This week",
-                            "quantity_needed": random.randint(10, 50),
+                            "quantity_needed": self.random.randint(10, 50),
                             "location": {"x": org.x, "y": org.y}
                         }
                         for shortage in org.current_shortages
@@ -794,12 +1880,8 @@ class TownSimulation:
             ]
         }
         
-        with open("data/sim_data/org_sync_data.json", "w") as f:
-            json.dump(org_sync_data, f, indent=2)
-        
-        # 5. Volunteer Match Agent Data
         volunteer_match_export = {
-            "volunteer_matches": self.volunteer_matches,
+            "volunteer_matches": list(self.volunteer_matches),
             "volunteer_profiles": [
                 {
                     "volunteer_id": person.id,
@@ -807,35 +1889,193 @@ class TownSimulation:
                     "skills": person.skills,
                     "reputation": person.reputation,
                     "location": {"x": person.x, "y": person.y},
-                    "availability_score": random.uniform(0.3, 1.0)
+                    "availability_score": self.random.uniform(0.3, 1.0)
                 }
-                for person in self.people if person.person_type == PersonType.VOLUNTEER
+                for person in map(self.people.person, self.people.indices_of_type(PersonType.VOLUNTEER))
             ],
-            "unmatched_requests": [
-                {
-                    "post_id": post.id,
-                    "category": post.category,
-                    "urgency": post.urgency,
-                    "location": {"x": post.location[0], "y": post.location[1]},
-                    "skills_needed": [skill for skill in self.skills if skill in post.description.lower()],
-                    "seeker_id": post.user_id
-                }
-                for post in self.posts 
-                if post.post_type == "request" and not any(match["post_id"] == post.id for match in self.volunteer_matches)
-            ]
+            "unmatched_requests": unmatched_requests
         }
+
+        return {
+            "exports": {
+                "complete_simulation.json": simulation_data,
+                "urgency_classifier_data.json": {"posts_for_classification": posts_for_classification},
+                "supply_demand_data.json": supply_demand_export,
+                "safety_trust_data.json": safety_data,
+                "org_sync_data.json": org_sync_data,
+                "volunteer_match_data.json": volunteer_match_export
+            },
+            "flagged_posts": flagged_posts
+        }
+
+    def build_columns(self) -> dict:
+        # typed columns for training scripts; strings become codes into the dictionary tables
+        posts = self.posts
+        n = len(posts)
+        titles = {}
+        descriptions = {}
+        post_columns = {
+            "id": np.fromiter((post.id for post in posts), dtype=np.int64, count=n),
+            "user_id": np.fromiter((post.user_id for post in posts), dtype=np.int64, count=n),
+            "post_type": np.fromiter((post.type_code for post in posts), dtype=np.int8, count=n),
+            "category": np.fromiter((post.category_code for post in posts), dtype=np.int8, count=n),
+            "urgency": np.fromiter((post.urgency_code for post in posts), dtype=np.int8, count=n),
+            "title": np.fromiter((titles.setdefault(post.title, len(titles)) for post in posts), dtype=np.int32, count=n),
+            "description": np.fromiter(
+                (descriptions.setdefault(post.description, len(descriptions)) for post in posts), dtype=np.int32, count=n
+            ),
+            "x": np.fromiter((post.x for post in posts), dtype=np.float64, count=n),
+            "y": np.fromiter((post.y for post in posts), dtype=np.float64, count=n),
+            "created_at": np.fromiter((post.created_at for post in posts), dtype=np.float64, count=n),
+            "safety_flags": np.fromiter((post.flags for post in posts), dtype=np.uint8, count=n),
+            "is_duplicate": np.fromiter((post.is_duplicate for post in posts), dtype=np.bool_, count=n),
+            "user_reputation": np.fromiter((post.user_reputation for post in posts), dtype=np.float64, count=n)
+        }
+        return {
+            "tables": {"posts": post_columns, "people": self.people.columns()},
+            "dictionary": {
+                "post_type": POST_TYPES,
+                "category": self.categories,
+                "urgency": URGENCY_VALUES,
+                "safety_flags": SAFETY_FLAGS,  # bit i of the safety_flags column
+                "person_type": [person_type.value for person_type in PERSON_TYPES],
+                "skill_mask": self.skills,  # bit i of skill_mask
+                "need_mask": self.categories,  # bit i of need_mask
+                "title": list(titles),
+                "description": list(descriptions)
+            }
+        }
+
+    def snapshot(self) -> "TownSimulation":
+        # cheap copy of everything build_exports reads; posts are never mutated once added,
+        # so the snapshot shares them and only copies the containers
+        state = copy.copy(self)
+        state.screen = None
+        state.renderer = None
+        state.snapshot_writer = None
+        state.posts = tuple(self.posts)
+        # build_exports draws from the RNG and fills the skill cache on the writer thread, so the
+        # snapshot gets its own of both; the live RNG stream no longer depends on thread timing
+        state.random = random.Random(self.random.getrandbits(64))
+        state._skill_mask_cache = dict(self._skill_mask_cache)
+        # only posts_created changes after generation; every other column is shared
+        state.people = copy.copy(self.people)
+        state.people.posts_created = self.people.posts_created.copy()
+        state.organizations = [replace(org, current_shortages=list(org.current_shortages)) for org in self.organizations]
+        state.supply_demand_data = list(self.supply_demand_data)
+        state.series = copy.deepcopy(self.series)
+        state.volunteer_matches = list(self.volunteer_matches)
+        return state
+
+    def save_simulation_data(self, background: bool = False):
+        if not background:
+            self.write_simulation_data()
+            return
+        if self.snapshot_writer is None:
+            self.snapshot_writer = SnapshotWriter()
+        self.snapshot_writer.submit(self.snapshot())
+
+    def write_simulation_data(self):
+        # on the snapshot writer thread this runs against a snapshot, which shares the live archive
+        # and SQLite sink but carries its own copies of the organizations and matches it writes
+        if self.archive is not None:
+            self.archive.flush()
+        if self.sqlite_sink is not None:
+            self.sqlite_sink.write(self)
+        built = self.build_exports()
+        write_exports(self.data_dir, built["exports"])
+        columns = self.build_columns()
+        write_columnar(os.path.join(self.data_dir, COLUMNAR_DIR), columns["tables"], columns["dictionary"])
         
-        with open("data/sim_data/volunteer_match_data.json", "w") as f:
-            json.dump(volunteer_match_export, f, indent=2)
-        
-        print(f"Simulation data saved to data/sim_data/")
-        print(f"Generated {len(self.posts)} posts from {len(self.people)} people and {len(self.organizations)} organizations")
+        print(f"Simulation data saved to {self.data_dir}/")
+        print(f"Generated {self.total_posts} posts from {len(self.people)} people and {len(self.organizations)} organizations")
         print(f"Found {len(self.volunteer_matches)} volunteer matches")
-        print(f"Detected {len([p for p in self.posts if p.safety_flags])} posts with safety flags")
+        print(f"Detected {built['flagged_posts']} posts with safety flags")
         
-    def run(self):
-        frame_count = 0
-        last_post_generation = 0
+    def now(self) -> float:
+        return self.epoch + self.sim_time
+
+    def schedule(self, delay: float, kind: str, arg=None):
+        self.events.push(self.sim_time + delay, kind, arg)
+
+    def schedule_every(self, interval: float, kind: str):
+        # recurring "match", "checkpoint" or "save" event; the interval rides along as the event arg
+        self.schedule(interval, kind, interval)
+
+    def schedule_recurring(self, checkpoint_every: int = None, match_every: int = None, save_every: int = None):
+        # intervals are in ticks, like the command-line options
+        if checkpoint_every:
+            self.enable_checkpoints()
+            self.schedule_every(checkpoint_every * SIM_TICK_SECONDS, "checkpoint")
+        if match_every:
+            self.schedule_every(match_every * SIM_TICK_SECONDS, "match")
+        if save_every:
+            self.schedule_every(save_every * SIM_TICK_SECONDS, "save")
+
+    def start_processes(self):
+        # every org runs its own update process with exponential gaps between updates
+        self.processes_started = True
+        for i in range(len(self.organizations)):
+            self.schedule(self.random.expovariate(1.0 / ORG_UPDATE_INTERVAL), "org_update", i)
+
+    def generate_arrivals(self, until: float):
+        # posts arriving in (sim_time, until]: a Poisson count with uniformly spread arrival times;
+        # drawn in bulk because nothing between here and the next post-reading event depends on them
+        duration = until - self.sim_time
+        if duration <= 0:
+            return
+        count = int(self.rng.poisson(POST_RATE_PER_SECOND * self.activity * duration))
+        if count:
+            times = np.sort(self.rng.uniform(self.sim_time, until, size=count)) + self.epoch
+            self.add_posts(self.generate_posts(count, created_at=times.tolist()))
+        self.sim_time = until
+
+    def handle_event(self, event_time: float, kind: str, arg):
+        if kind == "org_update":
+            self.update_organization(self.organizations[arg])
+            self.events.push(event_time + self.random.expovariate(1.0 / ORG_UPDATE_INTERVAL), "org_update", arg)
+            return
+        # everything else reads the posts, so arrivals are caught up to the event first
+        self.generate_arrivals(event_time)
+        if kind == "match":
+            self.generate_supply_demand_data()
+            self.generate_volunteer_matches()
+            self.schedule(arg, "match", arg)
+        elif kind == "checkpoint":
+            self.generate_supply_demand_data()
+            self.generate_volunteer_matches()
+            self.checkpoint()
+            self.schedule(arg, "checkpoint", arg)
+        elif kind == "save":
+            self.generate_supply_demand_data()
+            self.generate_volunteer_matches()
+            self.save_simulation_data(background=not self.headless)
+            self.schedule(arg, "save", arg)
+
+    def advance(self, duration: float):
+        # runs every scheduled event up to sim_time + duration; cost follows the number of events
+        if not self.processes_started:
+            self.start_processes()
+        end = self.sim_time + duration
+        events = self.events
+        while events.next_time() <= end:
+            self.handle_event(*events.pop())
+        self.generate_arrivals(end)
+        self.series.advance_to(self.sim_time)
+        self.apply_retention()
+
+    def step(self):
+        self.advance(SIM_TICK_SECONDS)
+
+    def run(self, time_scale: float = 1.0, checkpoint_every: int = None, match_every: int = None, save_every: int = None):
+        # fixed-timestep loop: the simulation advances SIM_TICK_SECONDS per step at time_scale x real
+        # time, catching up after slow frames; rendering reads a snapshot taken after the steps.
+        # Checkpoints are scheduled events too, by default every CHECKPOINT_INTERVAL_SECONDS of real time
+        if checkpoint_every is None:
+            checkpoint_every = window_checkpoint_ticks(time_scale)
+        self.schedule_recurring(checkpoint_every, match_every, save_every)
+        accumulator = 0.0
+        last_time = time.perf_counter()
         
         while self.running:
             for event in pygame.event.get():
@@ -845,43 +2085,345 @@ class TownSimulation:
                     if event.key == pygame.K_s:
                         self.generate_supply_demand_data()
                         self.generate_volunteer_matches() 
-                        self.save_simulation_data()
+                        self.save_simulation_data(background=True)
             
-            if frame_count - last_post_generation > FPS // 2:
-                for _ in range(random.randint(10, 30)):
-                    person = random.choice(self.people)
-                    if random.random() < 0.3:  # 30% chance any person posts
-                        post = self.generate_post(person)
-                        self.posts.append(post)
-                
-                last_post_generation = frame_count
-                
-                self.update_organizations()
-                
+            now = time.perf_counter()
+            accumulator += (now - last_time) * time_scale
+            last_time = now
+
+            ticks = 0
+            while accumulator >= SIM_TICK_SECONDS and ticks < MAX_TICKS_PER_FRAME:
+                self.step()
+                accumulator -= SIM_TICK_SECONDS
+                ticks += 1
+            if ticks == MAX_TICKS_PER_FRAME:
+                accumulator = min(accumulator, SIM_TICK_SECONDS)
 
-                # if len(self.posts) > 2000:
-                #     self.posts = self.posts[-800:]  # Keep most recent 800 posts
-            
             self.draw()
             self.clock.tick(FPS)
-            frame_count += 1
-            
-            if frame_count % (FPS * 10) == 0:
-                self.generate_supply_demand_data()
-                self.generate_volunteer_matches()
-                self.save_simulation_data()
         
         self.generate_supply_demand_data()
         self.generate_volunteer_matches()
-        self.save_simulation_data()
+        self.save_simulation_data(background=True)
+        self.snapshot_writer.close()
+        self.shutdown()
         
         pygame.quit()
 
+    def run_headless(self, max_ticks: int = None, max_posts: int = None, save: bool = True, checkpoint_every: int = None,
+                     max_seconds: float = None, match_every: int = None, save_every: int = None) -> dict:
+        # runs events as fast as the CPU allows; no display, no frame clock
+        start_posts = self.total_posts
+        start_sim_time = self.sim_time
+        start_time = time.perf_counter()
+        self.schedule_recurring(checkpoint_every, match_every, save_every)
+        # tick and post limits are checked once per tick; a bare duration advances whole chunks at a time
+        chunk = SIM_TICK_SECONDS if max_ticks is not None or max_posts is not None else HEADLESS_ADVANCE_SECONDS
+
+        try:
+            while self.running:
+                simulated = self.sim_time - start_sim_time
+                if max_ticks is not None and simulated >= max_ticks * SIM_TICK_SECONDS:
+                    break
+                if max_posts is not None and self.total_posts - start_posts >= max_posts:
+                    break
+                if max_seconds is not None and simulated >= max_seconds:
+                    break
+                self.advance(chunk if max_seconds is None else min(chunk, max_seconds - simulated))
+        except KeyboardInterrupt:
+            print("Interrupted, stopping simulation")
+
+        elapsed = time.perf_counter() - start_time
+        posts = self.total_posts - start_posts
+        simulated = self.sim_time - start_sim_time
+        ticks = int(round(simulated / SIM_TICK_SECONDS))
+        stats = {
+            "ticks": ticks,
+            "simulated_seconds": simulated,
+            "posts": posts,
+            "elapsed_seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+            "posts_per_second": posts / elapsed if elapsed > 0 else 0.0
+        }
+
+        print(f"Simulated {ticks} ticks ({simulated:.0f}s of town time) and {posts} posts in {elapsed:.2f}s")
+        print(f"{stats['ticks_per_second']:.1f} ticks/sec, {stats['posts_per_second']:.1f} posts/sec")
+
+        if save:
+            self.generate_supply_demand_data()
+            self.generate_volunteer_matches()
+            self.save_simulation_data()
+        self.shutdown()
+
+        return stats
+
+
+def window_checkpoint_ticks(time_scale: float) -> int:
+    return max(1, int(round(CHECKPOINT_INTERVAL_SECONDS * time_scale / SIM_TICK_SECONDS)))
+
+
+def district_grid(workers: int) -> tuple:
+    rows = int(math.sqrt(workers))
+    while workers % rows:
+        rows -= 1
+    return rows, workers // rows
+
+
+def run_district_worker(conn, spec: dict):
+    sim = TownSimulation(
+        headless=True,
+        data_dir=spec["data_dir"],
+        templates=spec["templates"],
+        population=spec["population"],
+        organizations=spec["organizations"],
+        seed=spec["seed"]
+    )
+    sim.num_people = spec["num_local"]  # halo volunteers sit after the district's own residents
+    sim.activity = spec["activity"]
+    sim.retention = spec["retention"]
+    sim.post_id_counter = spec["post_id_offset"]
+    sim.post_id_stride = spec["post_id_stride"]
+    sim.volunteer_index = VolunteerIndex(sim.people, sim.build_volunteer_index().indices, spec["index_bounds"])
+    sim.enable_checkpoints()  # every district checkpoints at least once, when the run stops
+
+    while True:
+        command, arg = conn.recv()
+        if command == "step":
+            for _ in range(arg):
+                sim.step()
+            conn.send({
+                "posts": sim.total_posts,
+                "offers": sim.category_offers,
+                "requests": sim.category_requests,
+                "series": sim.series
+            })
+        elif command == "checkpoint":
+            sim.generate_supply_demand_data()
+            sim.generate_volunteer_matches()
+            sim.checkpoint()
+            conn.send({"matches": len(sim.volunteer_matches)})
+        elif command == "stop":
+            sim.generate_supply_demand_data()
+            sim.shutdown()
+            conn.send(None)
+            break
+    conn.close()
+
+
+class ShardedTownSimulation:
+    # splits the town map into a grid of districts, each stepped by its own worker process;
+    # workers only exchange border volunteers (once, at start) and per-category counters
+    def __init__(self, town: TownSimulation, workers: int, halo: float = DISTRICT_HALO):
+        self.town = town
+        self.workers = workers
+        self.halo = halo
+        self.rows, self.cols = district_grid(workers)
+        self.connections = []
+        self.processes = []
+        self.district_stats = [{} for _ in range(workers)]
+
+    def _district_of(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        col = np.clip((x * self.cols // WINDOW_WIDTH).astype(np.int64), 0, self.cols - 1)
+        row = np.clip((y * self.rows // WINDOW_HEIGHT).astype(np.int64), 0, self.rows - 1)
+        return row * self.cols + col
+
+    def _bounds(self, district: int) -> tuple:
+        row, col = divmod(district, self.cols)
+        width, height = WINDOW_WIDTH / self.cols, WINDOW_HEIGHT / self.rows
+        return (col * width, row * height, (col + 1) * width, (row + 1) * height)
+
+    def start(self):
+        town = self.town
+        people = town.people
+        district = self._district_of(people.x, people.y)
+        volunteers = town.build_volunteer_index().indices
+        seeds = np.random.SeedSequence(int(town.rng.integers(2**32))).generate_state(self.workers)
+        org_districts = self._district_of(
+            np.array([org.x for org in town.organizations]), np.array([org.y for org in town.organizations])
+        ) if town.organizations else np.empty(0, dtype=np.int64)
+
+        for k in range(self.workers):
+            x0, y0, x1, y1 = self._bounds(k)
+            local = np.flatnonzero(district == k)
+            near = (
+                (people.x[volunteers] >= x0 - self.halo) & (people.x[volunteers] < x1 + self.halo) &
+                (people.y[volunteers] >= y0 - self.halo) & (people.y[volunteers] < y1 + self.halo)
+            )
+            halo = volunteers[near & (district[volunteers] != k)]
+            spec = {
+                "seed": int(seeds[k]),
+                "data_dir": os.path.join(town.data_dir, "districts", f"district-{k}"),
+                "templates": town.templates,
+                "population": Population.concat([people.subset(local), people.subset(halo)]),
+                "organizations": [org for org, d in zip(town.organizations, org_districts) if d == k],
+                "num_local": len(local),
+                "activity": town.activity * float(people.post_rate[local].sum()) / max(float(people.post_rate.sum()), 1e-9),
+                "retention": town.retention,
+                "post_id_offset": k + 1,
+                "post_id_stride": self.workers,
+                "index_bounds": (
+                    max(0, x0 - self.halo), max(0, y0 - self.halo),
+                    min(WINDOW_WIDTH, x1 + self.halo), min(WINDOW_HEIGHT, y1 + self.halo)
+                )
+            }
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=run_district_worker, args=(child_conn, spec), daemon=True)
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def _broadcast(self, command: str, arg=None) -> List[dict]:
+        for conn in self.connections:
+            conn.send((command, arg))
+        return [conn.recv() for conn in self.connections]
+
+    def sync(self, ticks: int) -> int:
+        self.district_stats = self._broadcast("step", ticks)
+        self.town.category_offers = sum(stats["offers"] for stats in self.district_stats)
+        self.town.category_requests = sum(stats["requests"] for stats in self.district_stats)
+        self.town.series = CategoryTimeSeries.merge([stats["series"] for stats in self.district_stats])
+        self.town.sim_time = self.town.series.time
+        return sum(stats["posts"] for stats in self.district_stats)
+
+    def run(self, max_ticks: int = None, max_posts: int = None, checkpoint_every: int = None,
+            sync_every: int = DISTRICT_SYNC_TICKS) -> dict:
+        self.start()
+        ticks = 0
+        posts = 0
+        start_time = time.perf_counter()
+        try:
+            while True:
+                if max_ticks is not None and ticks >= max_ticks:
+                    break
+                if max_posts is not None and posts >= max_posts:
+                    break
+                batch = sync_every if max_ticks is None else min(sync_every, max_ticks - ticks)
+                posts = self.sync(batch)
+                ticks += batch
+                if checkpoint_every and ticks % checkpoint_every < batch:
+                    self._broadcast("checkpoint")
+        except KeyboardInterrupt:
+            print("Interrupted, stopping districts")
+        elapsed = time.perf_counter() - start_time
+        self.stop()  # each district writes its final checkpoint on stop
+
+        stats = {
+            "workers": self.workers,
+            "ticks": ticks,
+            "posts": posts,
+            "elapsed_seconds": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed > 0 else 0.0,
+            "posts_per_second": posts / elapsed if elapsed > 0 else 0.0
+        }
+        print(f"Simulated {ticks} ticks and {posts} posts across {self.workers} districts in {elapsed:.2f}s")
+        print(f"{stats['ticks_per_second']:.1f} ticks/sec, {stats['posts_per_second']:.1f} posts/sec")
+        self.save_summary(stats)
+        return stats
+
+    def save_summary(self, stats: dict):
+        town = self.town
+        town.generate_supply_demand_data()
+        snapshot = list(town.supply_demand_data)[-len(town.categories):]
+        os.makedirs(town.data_dir, exist_ok=True)
+        summary = {
+            "run": stats,
+            "districts": [
+                {"district": k, "bounds": self._bounds(k), "posts": d.get("posts", 0)}
+                for k, d in enumerate(self.district_stats)
+            ],
+            "supply_demand": [asdict(sd) for sd in snapshot]
+        }
+        with open(os.path.join(town.data_dir, "districts_summary.json"), "w") as f:
+            json.dump(summary, f, indent=2, default=str)
+        print(f"District summary saved to {town.data_dir}/districts_summary.json")
+
+    def stop(self):
+        if self.connections:
+            self._broadcast("stop")
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Community Town Simulation")
+    parser.add_argument('--headless', action='store_true', help='Run without a display, as fast as possible')
+    parser.add_argument('--ticks', type=int, help='Stop after this many simulation ticks (headless)')
+    parser.add_argument('--posts', type=int, help='Stop after this many posts have been generated (headless)')
+    parser.add_argument('--duration', type=float, help='Stop after this many simulated seconds (headless, e.g. 2592000 for a month)')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='Directory for exported simulation data')
+    parser.add_argument('--checkpoint-every', type=int,
+                        help=f'Append an incremental checkpoint every N ticks (window mode defaults to every {CHECKPOINT_INTERVAL_SECONDS}s of real time)')
+    parser.add_argument('--match-every', type=int, help='Refresh supply/demand snapshots and volunteer matches every N ticks')
+    parser.add_argument('--save-every', type=int, help='Write the full data export every N ticks')
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), help='Named preset for town size, activity and seed')
+    parser.add_argument('--seed', type=int, help='Random seed (overrides the scenario seed)')
+    parser.add_argument('--people', type=int, default=300, help='Number of people (ignored with --scenario)')
+    parser.add_argument('--organizations', type=int, default=15, help='Number of organizations (ignored with --scenario)')
+    parser.add_argument('--time-scale', type=float, default=1.0, help='Simulated seconds per real second (window mode)')
+    parser.add_argument('--workers', type=int, default=1, help='Split the town into this many districts, one process each (headless)')
+    parser.add_argument('--activity', type=float, default=1.0, help='Multiplier on posting attempts per tick (ignored with --scenario)')
+    parser.add_argument('--retain-posts', type=int, help='Keep at most this many posts in memory, archiving older ones')
+    parser.add_argument('--retain-seconds', type=float, help='Archive posts older than this many seconds')
+    parser.add_argument('--templates', help='JSON file with post templates (defaults to the built-in catalog)')
+    parser.add_argument('--no-save', action='store_true', help='Skip the final data export (headless)')
+    parser.add_argument('--sqlite', nargs='?', const=SQLITE_PATH,
+                        help=f'Stream posts, organizations and matches into this SQLite database (default {SQLITE_PATH})')
+    args = parser.parse_args()
+    if args.sqlite and args.workers > 1:
+        parser.error("--sqlite is not supported with --workers (SQLite has a single writer)")
+    if (args.match_every or args.save_every) and args.workers > 1:
+        parser.error("--match-every and --save-every are not supported with --workers (districts only checkpoint)")
+    return args
+
+
 if __name__ == "__main__":
-    print("Starting Community Town Simulation")
-    print("Press 'S' to save data manually")
-    print("Data auto-saves every 30 seconds")
-    print("Close window to exit and save final data")
-    
-    simulation = TownSimulation()
-    simulation.run()
\ No newline at end of file
+    args = parse_args()
+    templates = PostTemplateCatalog.load(args.templates) if args.templates else None
+
+    def build_simulation(headless: bool) -> TownSimulation:
+        if args.scenario:
+            return TownSimulation.from_scenario(args.scenario, seed=args.seed, headless=headless,
+                                                data_dir=args.data_dir, templates=templates)
+        simulation = TownSimulation(headless=headless, data_dir=args.data_dir, templates=templates,
+                                    num_people=args.people, num_organizations=args.organizations, seed=args.seed)
+        simulation.activity = args.activity
+        return simulation
+
+    def configure(simulation: TownSimulation) -> TownSimulation:
+        simulation.retention = RetentionPolicy(max_posts=args.retain_posts, max_age_seconds=args.retain_seconds)
+        if args.sqlite:
+            try:
+                simulation.sqlite_sink = SQLiteSink(args.sqlite)
+            except ValueError as e:
+                raise SystemExit(f"error: {e}")
+        return simulation
+
+    if args.headless and args.workers > 1:
+        print(f"Starting sharded Community Town Simulation with {args.workers} districts")
+        town = configure(build_simulation(headless=True))
+        max_ticks = args.ticks
+        if args.duration is not None:
+            duration_ticks = int(math.ceil(args.duration / SIM_TICK_SECONDS))
+            max_ticks = duration_ticks if max_ticks is None else min(max_ticks, duration_ticks)
+        ShardedTownSimulation(town, args.workers).run(
+            max_ticks=max_ticks, max_posts=args.posts, checkpoint_every=args.checkpoint_every
+        )
+    elif args.headless:
+        print("Starting headless Community Town Simulation")
+        simulation = configure(build_simulation(headless=True))
+        simulation.run_headless(max_ticks=args.ticks, max_posts=args.posts, save=not args.no_save,
+                                checkpoint_every=args.checkpoint_every, max_seconds=args.duration,
+                                match_every=args.match_every, save_every=args.save_every)
+    else:
+        print("Starting Community Town Simulation")
+        print("Press 'S' to save data manually")
+        checkpoint_every = args.checkpoint_every or window_checkpoint_ticks(args.time_scale)
+        print(f"Incremental checkpoints are appended every {checkpoint_every} ticks under {os.path.join(args.data_dir, CHECKPOINT_DIR)}/")
+        print("Close window to exit and save final data")
+
+        simulation = configure(build_simulation(headless=False))
+        simulation.run(time_scale=args.time_scale, checkpoint_every=checkpoint_every,
+                       match_every=args.match_every, save_every=args.save_every)
@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from datetime import datetime
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from sim import SCENARIOS, TownSimulation
+
+BENCHMARK_TICKS = {
+    "small": 2000,
+    "medium": 500,
+    "city": 100
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def benchmark_scenario(name: str, ticks: int, seed: int = None) -> dict:
+    with tempfile.TemporaryDirectory() as data_dir:
+        init_time, simulation = timed(TownSimulation.from_scenario, name, seed=seed, headless=True, data_dir=data_dir)
+
+        def generate():
+            for _ in range(ticks):
+                simulation.step()
+
+        generate_time, _ = timed(generate)
+        snapshot_time, _ = timed(simulation.generate_supply_demand_data)
+        matching_time, _ = timed(simulation.generate_volunteer_matches)
+        with contextlib.redirect_stdout(sys.stderr):
+            save_time, _ = timed(simulation.save_simulation_data)
+
+    posts = len(simulation.posts)
+    return {
+        "scenario": name,
+        "seed": simulation.seed,
+        "num_people": simulation.num_people,
+        "num_organizations": simulation.num_organizations,
+        "ticks": ticks,
+        "posts": posts,
+        "matches": len(simulation.volunteer_matches),
+        "timings": {
+            "init_seconds": init_time,
+            "post_generation_seconds": generate_time,
+            "supply_demand_snapshot_seconds": snapshot_time,
+            "matching_seconds": matching_time,
+            "save_seconds": save_time
+        },
+        "rates": {
+            "ticks_per_second": ticks / generate_time if generate_time > 0 else 0.0,
+            "posts_per_second": posts / generate_time if generate_time > 0 else 0.0
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the town simulation on seeded scenario presets")
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable, defaults to small and medium)')
+    parser.add_argument('--ticks', type=int, help='Ticks of post generation per scenario (defaults per scenario)')
+    parser.add_argument('--seed', type=int, help='Override the scenario seed')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per scenario; every run is reported')
+    parser.add_argument('--output-file', help='JSON file to save results')
+    args = parser.parse_args()
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "runs": []
+    }
+
+    for name in args.scenario or ["small", "medium"]:
+        ticks = args.ticks or BENCHMARK_TICKS[name]
+        for run in range(args.repeat):
+            print(f"Benchmarking {name} ({ticks} ticks, run {run + 1}/{args.repeat})", file=sys.stderr)
+            results["runs"].append(benchmark_scenario(name, ticks, seed=args.seed))
+
+    if args.output_file:
+        with open(args.output_file, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.output_file}", file=sys.stderr)
+    else:
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import random
+
+from content_scanner import ContentScanner, SUSPICIOUS_PATTERNS
+
+
+def naive_scan(text):
+    text = text.lower()
+    return [flag_type for flag_type, keywords in SUSPICIOUS_PATTERNS if any(k in text for k in keywords)]
+
+
+def test_scanner_overlapping_keywords():
+    scanner = ContentScanner()
+    assert scanner.scan("cashop") == ["scam"]
+    assert scanner.scan("Limited timeet alone") == ["inappropriate", "spam"]  # limited time, meet alone
+    assert scanner.scan("limited time to meet alone, wire money") == ["scam", "inappropriate", "spam"]
+    assert scanner.scan("a quiet afternoon") == []
+
+
+def test_scanner_matches_substring_check():
+    rng = random.Random(14)
+    pieces = [k for _, keywords in SUSPICIOUS_PATTERNS for k in keywords] + ["shop", "et", " ", "a", "Urgent", "PRIV"]
+    scanner = ContentScanner(cache_size=0)
+    for _ in range(20000):
+        text = "".join(rng.choice(pieces)[:rng.randint(1, 12)] for _ in range(rng.randint(0, 6)))
+        assert scanner.scan(text) == naive_scan(text), text
@@ -0,0 +1,216 @@
+import pytest
+from types import SimpleNamespace
+
+from models.base_agent import DatabaseManager
+from models.query_cache import QueryCache
+
+
+class FakeQuery:
+    # just enough of the supabase query builder for DatabaseManager: equality and keyset filters,
+    # ordering, limits and writes against in-memory rows
+    def __init__(self, client, table_name):
+        self.client = client
+        self.table_name = table_name
+        self.filters = []
+        self.order_key = None
+        self.limit_rows = None
+        self.write = None
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row[column] > value)
+        return self
+
+    def order(self, column):
+        self.order_key = column
+        return self
+
+    def limit(self, rows):
+        self.limit_rows = rows
+        return self
+
+    def insert(self, record):
+        self.write = record
+        return self
+
+    def update(self, updates):
+        return self.insert(updates)
+
+    def upsert(self, record, on_conflict=None):
+        return self.insert(record)
+
+    def execute(self):
+        self.client.queries.append(self.table_name)
+        if self.client.fail_on is not None and len(self.client.queries) == self.client.fail_on:
+            raise ConnectionError("connection reset")
+        if self.write is not None:
+            self.client.rows.setdefault(self.table_name, []).append(dict(self.write))
+            return SimpleNamespace(data=[self.write])
+        rows = [row for row in self.client.rows.get(self.table_name, []) if all(f(row) for f in self.filters)]
+        if self.order_key:
+            rows.sort(key=lambda row: row[self.order_key])
+        if self.limit_rows is not None:
+            rows = rows[:self.limit_rows]
+        if self.columns != "*":
+            names = self.columns.split(",")
+            rows = [{name: row[name] for name in names if name in row} for row in rows]
+        return SimpleNamespace(data=rows)
+
+
+class FakeClient:
+    def __init__(self, rows=None, fail_on=None):
+        self.rows = rows or {}
+        self.queries = []
+        self.fail_on = fail_on  # 1-based number of the execute() call that raises
+
+    def table(self, table_name):
+        return FakeQuery(self, table_name)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_manager(rows=None, fail_on=None, ttl_seconds=None):
+    clock = FakeClock()
+    cache = QueryCache(ttl_seconds or {'categories': 600, 'organization': 120}, clock=clock)
+    client = FakeClient(rows, fail_on)
+    return DatabaseManager(client, cache=cache), client, clock
+
+
+CATEGORIES = [{'id': 1, 'name': 'food'}, {'id': 2, 'name': 'shelter'}]
+
+
+def test_repeated_category_lookups_query_once():
+    db, client, _ = make_manager({'categories': list(CATEGORIES)})
+    for _ in range(300):
+        assert db.select_all('categories') == CATEGORIES
+    assert client.queries == ['categories']
+    stats = db.cache.stats()['categories']
+    assert (stats['hits'], stats['misses'], stats['entries']) == (299, 1, 1)
+
+
+def test_cached_result_is_a_copy():
+    db, _, _ = make_manager({'categories': list(CATEGORIES)})
+    db.select_all('categories').append({'id': 3, 'name': 'junk'})
+    assert db.select_all('categories') == CATEGORIES
+
+
+def test_filters_and_columns_are_separate_entries():
+    db, client, _ = make_manager({'categories': list(CATEGORIES)})
+    assert db.select_all('categories', {'id': 1}) == [CATEGORIES[0]]
+    assert db.select_all('categories', {'id': '1'}) == []
+    assert [row['name'] for row in db.select_all('categories', columns=['name'])] == ['food', 'shelter']
+    db.select_all('categories', {'id': 1})
+    assert len(client.queries) == 3
+
+
+def test_entries_expire_after_ttl():
+    db, client, clock = make_manager({'categories': list(CATEGORIES)})
+    db.select_all('categories')
+    clock.now = 599
+    db.select_all('categories')
+    assert len(client.queries) == 1
+    clock.now = 600
+    db.select_all('categories')
+    assert len(client.queries) == 2
+
+
+def test_uncached_tables_always_query():
+    db, client, _ = make_manager({'posts': [{'id': 1, 'status': 'open'}]})
+    for _ in range(3):
+        assert len(db.select_all('posts', {'status': 'open'})) == 1
+    assert client.queries == ['posts'] * 3
+    assert db.cache.stats()['categories']['entries'] == 0
+
+
+@pytest.mark.parametrize("write", [
+    lambda db: db.insert('categories', {'id': 3, 'name': 'transport'}),
+    lambda db: db.update('categories', {'name': 'meals'}, {'id': 1}),
+    lambda db: db.upsert('categories', {'id': 3, 'name': 'transport'}, on_conflict=['id'])
+])
+def test_writes_invalidate_the_table(write):
+    db, client, _ = make_manager({'categories': list(CATEGORIES), 'organization': [{'id': 1}]})
+    db.select_all('categories')
+    db.select_all('organization')
+    write(db)
+    db.select_all('categories')
+    db.select_all('organization')
+    assert client.queries.count('categories') == 3  # read, write, read again
+    assert client.queries.count('organization') == 1
+
+
+def test_failed_write_still_invalidates():
+    db, client, _ = make_manager({'categories': list(CATEGORIES)}, fail_on=2)
+    db.select_all('categories')
+    assert db.insert('categories', {'id': 3}) is None
+    db.select_all('categories')
+    assert client.queries == ['categories'] * 3
+
+
+def test_load_overlapping_a_write_is_not_stored():
+    cache = QueryCache({'categories': 600}, clock=FakeClock())
+    loads = []
+
+    def stale_load():
+        # another thread writes the table while this read is in flight
+        loads.append(1)
+        cache.invalidate('categories')
+        return ['stale']
+
+    assert cache.get_or_load('categories', 'all', stale_load) == ['stale']
+    assert cache.get_or_load('categories', 'all', lambda: loads.append(1) or ['fresh']) == ['fresh']
+    assert cache.get_or_load('categories', 'all', lambda: loads.append(1) or ['again']) == ['fresh']
+    assert len(loads) == 2
+
+
+def test_failed_load_is_not_cached():
+    db, client, _ = make_manager({'categories': list(CATEGORIES)}, fail_on=1)
+    assert db.select_all('categories') == []
+    assert db.select_all('categories') == CATEGORIES
+    assert len(client.queries) == 2
+
+
+def test_stream_pages_by_key():
+    rows = [{'id': i, 'status': 'open' if i % 5 else 'closed'} for i in range(2500, 0, -1)]
+    db, client, _ = make_manager({'posts': rows})
+    streamed = list(db.stream('posts', page_size=1000))
+    assert [row['id'] for row in streamed] == list(range(1, 2501))
+    assert len(client.queries) == 3
+
+    client.queries.clear()
+    open_ids = [row['id'] for row in db.stream('posts', {'status': 'open'}, page_size=1000, columns=['status'])]
+    assert open_ids == [i for i in range(1, 2501) if i % 5]
+    assert len(client.queries) == 3  # 2000 open rows: two full pages, then an empty one
+
+
+def test_stream_exact_multiple_of_page_size():
+    db, client, _ = make_manager({'posts': [{'id': i} for i in range(1, 2001)]})
+    assert len(list(db.stream('posts', page_size=1000))) == 2000
+    assert len(client.queries) == 3  # the last, empty page ends the stream
+
+
+def test_stream_failure_on_first_page_is_empty():
+    db, _, _ = make_manager({'posts': [{'id': i} for i in range(1, 11)]}, fail_on=1)
+    assert list(db.stream('posts', page_size=5)) == []
+
+
+def test_stream_failure_after_first_page_raises():
+    db, _, _ = make_manager({'posts': [{'id': i} for i in range(1, 11)]}, fail_on=2)
+    streamed = []
+    with pytest.raises(RuntimeError, match="after id 5"):
+        for row in db.stream('posts', page_size=5):
+            streamed.append(row['id'])
+    assert streamed == [1, 2, 3, 4, 5]
+
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import subprocess
+
+# cold-start budget for importing the agent packages; override for slow CI machines
+IMPORT_BUDGET_SECONDS = float(os.getenv("MODELS_IMPORT_BUDGET_SECONDS", "1.0"))
+IMPORT_RUNS = 3
+HEAVY_MODULES = ["google.adk", "supabase", "httpx"]
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str) -> dict:
+    # fresh interpreter per run so nothing is already cached in sys.modules; best of IMPORT_RUNS
+    best = None
+    for _ in range(IMPORT_RUNS):
+        output = subprocess.check_output(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, text=True
+        )
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def check_import_budget(module: str):
+    result = measure_import(module)
+    print(f"import {module}: {result['seconds'] * 1000:.1f} ms (budget {IMPORT_BUDGET_SECONDS * 1000:.0f} ms)")
+    assert not result["loaded"], f"import {module} pulled in {result['loaded']}"
+    assert result["seconds"] <= IMPORT_BUDGET_SECONDS, (
+        f"import {module} took {result['seconds']:.3f}s, budget is {IMPORT_BUDGET_SECONDS:.3f}s"
+    )
+
+
+def test_models_import_time():
+    check_import_budget("models")
+
+
+def test_agent_runner_import_time():
+    check_import_budget("models.agent_runner")
+
+
+def main():
+    print("=" * 60)
+    print("Import Time Budget")
+    print("=" * 60)
+
+    test_models_import_time()
+    test_agent_runner_import_time()
+
+
+if __name__ == "__main__":
+    main()